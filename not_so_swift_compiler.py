@@ -1,15 +1,49 @@
-from src.start_compiler import start_compiler
+from src.optimizer import max_optimization_level
+from src.start_compiler import lexer_names, parser_names, start_compiler
 
 if __name__ == '__main__':
     import argparse
+    import sys
 
     parser = argparse.ArgumentParser(description='Not so swift compiler.')
-    parser.add_argument('-i', '--f_input',
-                        help='path to input file...',  required=True)
+    inputs = parser.add_mutually_exclusive_group(required=True)
+    inputs.add_argument('-i', '--f_input',
+                        help='path to input file...')
+    inputs.add_argument('-b', '--batch', nargs='+',
+                        help='directories or glob patterns of input files compiled in more processes...')
     parser.add_argument('-o', '--out',  default="./",
                         help='path to output dir...')
     parser.add_argument('-qt', '--show_tree_with_pyqt5',  default=False,  type=bool,
                         help='True/False')
+    parser.add_argument('-O', dest='optimization_level', default=0, type=int,
+                        choices=range(max_optimization_level + 1),
+                        help='optimization level, -O0 disables optimizations...')
+    parser.add_argument('-c', '--cache', default=None,
+                        help='path to dir with cached tables of symbols of unchanged inputs...')
+    parser.add_argument('-nt', '--no_tree_files', dest='save_tree_files', action='store_false',
+                        help='do not save drawings of the syntax tree (faster start without ete3)...')
+    parser.add_argument('-l', '--lexer', default="ply", choices=lexer_names,
+                        help='lexer, regex is a faster hand-written lexer producing the same tokens as ply, '
+                             'parallel scans parts of large inputs by regex lexers in more processes...')
+    parser.add_argument('-s', '--stream', dest='stream_input', action='store_true',
+                        help='read the input in chunks while it is parsed by the regex lexer (large inputs)...')
+    parser.add_argument('-p', '--parser', default="ply", choices=parser_names,
+                        help='parser, descent is a recursive descent parser building the same tree as ply...')
+    parser.add_argument('-j', '--jobs', default=None, type=int,
+                        help='number of processes compiling the batch, defaults to the number of CPUs...')
     args = parser.parse_args()
 
-    start_compiler(input_file_name=args.f_input, output_dir=args.out, show_tree_with_pyqt5=args.show_tree_with_pyqt5)
+    if args.batch is not None:
+        # the pool of processes is imported only when it is used
+        from src.batch_compiler import compile_batch
+
+        results = compile_batch(args.batch, output_dir=args.out, workers=args.jobs,
+                                optimization_level=args.optimization_level, cache_dir=args.cache,
+                                save_tree_files=args.save_tree_files, lexer_name=args.lexer,
+                                stream_input=args.stream_input, parser_name=args.parser)
+        sys.exit(1 if any(i[1] is not None for i in results) else 0)
+
+    start_compiler(input_file_name=args.f_input, output_dir=args.out, show_tree_with_pyqt5=args.show_tree_with_pyqt5,
+                   optimization_level=args.optimization_level, cache_dir=args.cache,
+                   save_tree_files=args.save_tree_files, lexer_name=args.lexer,
+                   stream_input=args.stream_input, parser_name=args.parser)
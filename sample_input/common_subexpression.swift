@@ -0,0 +1,8 @@
+var a: Int = 6;
+var b: Int = 7;
+var c: Int = a * b + 1;
+var d: Int = 0;
+d = c > 40 ? a * b : a * b - 1;
+c = a * b;
+a += 1;
+d = a * b;
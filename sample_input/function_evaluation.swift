@@ -0,0 +1,13 @@
+var side: Int = 0;
+var size: Int = 0;
+func square(x: Int) -> Int {
+    var result: Int = x * x;
+    return result;
+}
+func area(width: Int, height: Int) -> Int {
+    var result: Int = width * height;
+    return result;
+}
+side = square(12);
+size = area(4, 5);
+size = area(side, 2);
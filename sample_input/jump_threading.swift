@@ -0,0 +1,11 @@
+var a: Int = 5;
+var b: Int = 0;
+while a > 0 {
+    a -= 1;
+    if (a > 2) {
+        b += 1;
+    }
+    else {
+        b -= 1;
+    }
+}
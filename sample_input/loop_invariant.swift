@@ -0,0 +1,14 @@
+var a: Int = 6;
+var b: Int = 7;
+var sum: Int = 0;
+while sum < 100 {
+    sum += a * b;
+}
+func scale(x: Int, y: Int) -> Int {
+    var res: Int = 0;
+    for(var i: Int = 0; i < 10; i += 1;) {
+        res += x * y + 1;
+    }
+    return res;
+}
+sum = scale(a, 3);
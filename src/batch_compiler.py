@@ -0,0 +1,125 @@
+#  date: 19. 10. 2026
+#
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.start_compiler import get_parser, start_compiler
+
+# name of the file with the summary of the batch in the output directory
+summary_file_name = "batch_summary.txt"
+
+
+def find_sources(paths) -> list:
+    """
+    It returns sorted paths of .swift files, directories are searched recursively
+
+    :param paths: paths of directories or files, glob patterns are expanded
+    """
+    sources = set()
+    for path in paths:
+        for match in glob.glob(path, recursive=True) or [path]:
+            if os.path.isdir(match):
+                sources.update(glob.glob(os.path.join(glob.escape(match), "**", "*.swift"), recursive=True))
+            elif os.path.isfile(match) and match.endswith(".swift"):
+                sources.add(match)
+    if not sources:
+        raise Exception(f"No .swift files found in {', '.join(paths)}.")
+    return sorted(os.path.normpath(i) for i in sources)
+
+
+def get_output_dirs(sources, output_dir) -> list:
+    """
+    It returns output directories of the sources, paths of the sources relative to their common directory
+    are kept under the output directory, so sources with the same name do not overwrite outputs of each other
+
+    :param sources: paths of the sources
+    :param output_dir: directory of the outputs of the batch
+    """
+    base = os.path.commonpath([os.path.dirname(os.path.abspath(i)) for i in sources])
+    return [os.path.join(output_dir, os.path.splitext(os.path.relpath(os.path.abspath(i), base))[0], "")
+            for i in sources]
+
+
+def init_worker(lexer_name, parser_name):
+    """
+    It builds the lexer and the parser when the worker process starts, they are reused by all its compilations
+
+    :param lexer_name: name of the lexer
+    :param parser_name: name of the parser
+    """
+    get_parser(lexer_name, parser_name)
+
+
+def compile_file(input_file_name, output_dir, options) -> tuple:
+    """
+    It compiles one source of the batch and returns a tuple (input file, error message or None, seconds)
+
+    :param input_file_name: path of the source
+    :param output_dir: output directory of the source
+    :param options: keyword arguments of start_compiler
+    """
+    start = time.perf_counter()
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        start_compiler(input_file_name, output_dir=output_dir, **options)
+    except Exception as e:
+        return input_file_name, str(e) or type(e).__name__, time.perf_counter() - start
+    return input_file_name, None, time.perf_counter() - start
+
+
+def get_summary(results, seconds, workers) -> str:
+    """
+    It returns the summary of the batch, the number of successes and failures, times and errors of the sources
+
+    :param results: results of compile_file
+    :param seconds: time of the whole batch
+    :param workers: number of processes
+    """
+    failures = [i for i in results if i[1] is not None]
+    total = sum(i[2] for i in results)
+    slowest = max(results, key=lambda i: i[2])
+    lines = [f"compiled {len(results)} files in {seconds:.3f} s by {workers} processes: "
+             f"{len(results) - len(failures)} succeeded, {len(failures)} failed\n",
+             f"time of compilations {total:.3f} s, mean {total / len(results):.3f} s, "
+             f"slowest {slowest[2]:.3f} s {slowest[0]}\n"]
+    for input_file_name, error, file_seconds in results:
+        lines.append(f"{'ok' if error is None else 'FAILED':6} {file_seconds:8.3f} s  {input_file_name}\n")
+        if error is not None:
+            lines.append(f"{'':17}{error.strip()}\n")
+    return "".join(lines)
+
+
+def compile_batch(paths, output_dir="./", workers=None, **options) -> list:
+    """
+    It compiles all .swift files of the paths in a pool of processes, every process builds the lexer
+    and the parser once. The summary is saved to batch_summary.txt in the output directory.
+
+    :param paths: paths of directories or files, glob patterns are expanded
+    :param output_dir: directory of the outputs, the outputs of a source are saved under its relative path,
+    defaults to ./ (optional)
+    :param workers: number of processes, defaults to the number of CPUs, 1 compiles in this process (optional)
+    :param options: keyword arguments of start_compiler
+    :return: list of tuples (input file, error message or None, seconds) in the order of the sources
+    """
+    start = time.perf_counter()
+    sources = find_sources(paths)
+    output_dirs = get_output_dirs(sources, output_dir)
+    workers = min(workers or os.cpu_count() or 1, len(sources))
+    lexer_name = "regex" if options.get("stream_input") else options.get("lexer_name", "ply")
+    parser_name = options.get("parser_name", "ply")
+    # PLY writes missing or outdated LALR tables to parsetab.py, they are written here before the pool starts,
+    # so the workers only read them and never write the file at the same time
+    init_worker(lexer_name, parser_name)
+    if workers == 1:
+        results = [compile_file(i, j, options) for i, j in zip(sources, output_dirs)]
+    else:
+        with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(lexer_name, parser_name)) as pool:
+            results = list(pool.map(compile_file, sources, output_dirs, [options] * len(sources)))
+    summary = get_summary(results, time.perf_counter() - start, workers)
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, summary_file_name), mode="w") as txt:
+        txt.writelines(summary)
+    print(summary, end="")
+    return results
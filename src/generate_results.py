@@ -2,26 +2,30 @@
 #  author: Daniel Schnurpfeil
 #
 import os
+import shutil
 
-from src.pl0_vm.p_machine import run_pl0_code
+from src.syntax_analyzer.ast_node import to_ete_tree
 
 
-def generate_output_files(dst, generated_code, output_dir):
+def generate_output_files(dst, generated_code, output_dir, save_tree_files=True):
     """
     It generates output files
 
     :param dst: syntax tree
     :param generated_code: a list of strings, each of which is a line of generated code
+    :param save_tree_files: If False, drawings of the tree are not saved, they need ete3, defaults to True (optional)
     """
+    if output_dir[-1] != "/":
+        output_dir += "/"
     if "output" not in os.listdir(output_dir):
-        if output_dir[-1] != "/":
-            output_dir += "/"
         os.mkdir(output_dir + "output")
     output_dir += "output"
-    with open(output_dir + "/full_tree.txt", mode="w") as tree:
-        tree.writelines(dst.get_ascii(attributes=["name", "dist", "label", "complex"]))
-    with open(output_dir + "/tree.txt", mode="w") as tree:
-        tree.writelines(str(dst))
+    if save_tree_files:
+        ete_tree = to_ete_tree(dst)
+        with open(output_dir + "/full_tree.txt", mode="w") as tree:
+            tree.writelines(ete_tree.get_ascii(attributes=["name", "dist", "label", "complex", "dtype"]))
+        with open(output_dir + "/tree.txt", mode="w") as tree:
+            tree.writelines(str(ete_tree))
     with open(output_dir + "/symbol_table.txt", mode="w") as table:
         generated_code.print_symbol_table(table.writelines)
     return output_dir
@@ -35,28 +39,49 @@ def visualize_dst(dst, show_tree_with_pyqt5):
         tree_style.show_leaf_name = True
         tree_style.mode = "c"
         tree_style.arc_start = -180  # 0 degrees = 3 o'clock
-        dst.show(
+        to_ete_tree(dst).show(
             tree_style=tree_style
         )
 
 
-def save_generated_code(generated_code, formatted_input_code, output_dir):
+def save_generated_code(generated_code, formatted_input_code, output_dir, input_file_name=None):
     """
     It saves the generated code to a file
 
     :param generated_code: The code that was generated by the model
-    :param formatted_input_code: The input code, formatted with the correct indentation
+    :param formatted_input_code: The input code, formatted with the correct indentation, None if it was streamed
+    :param input_file_name: The input file, it is copied in chunks if formatted_input_code is None
     """
     if generated_code.return_code() != "":
+        from src.pl0_vm.p_machine import run_pl0_code
         # Writing the generated code to a file.
         with open(output_dir + "/generated_code_only.txt", mode="w") as txt:
             txt.writelines(generated_code.return_code())
         with open(output_dir + "/generated_code_with_input.txt", mode="w") as txt:
             txt.writelines("----------input code----------------\n")
-            txt.writelines(formatted_input_code)
+            if formatted_input_code is not None:
+                txt.writelines(formatted_input_code)
+            else:
+                with open(input_file_name) as f:
+                    shutil.copyfileobj(f, txt)
             txt.writelines("\n")
             txt.writelines("----------generated code------------\n")
             txt.writelines(generated_code.return_code())
             txt.writelines("-------------PL/0 start-------------\n")
-            txt.writelines(run_pl0_code(generated_code.code))
-            txt.writelines("------------------------------------")
\ No newline at end of file
+            try:
+                txt.writelines(run_pl0_code(generated_code.code))
+            except Exception as e:
+                # the program is compiled even if the machine fails to run it
+                txt.writelines(f"ERR in executing generated code: {e!r}\n")
+            txt.writelines("------------------------------------")
+
+
+def save_passes_report(pass_manager, output_dir):
+    """
+    It saves time and changes of the optimization passes to a file
+
+    :param pass_manager: pass manager that optimized the program
+    :param output_dir: The directory where the output files are saved
+    """
+    with open(output_dir + "/passes_report.txt", mode="w") as txt:
+        txt.writelines(pass_manager.get_report())
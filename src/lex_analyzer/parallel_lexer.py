@@ -0,0 +1,126 @@
+#  date: 19. 10. 2026
+#
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from src.lex_analyzer.regex_lexer import RegexLexer, Token
+
+# inputs are split to parts of at least this number of characters (256 KiB), so an input needs at least 512 KiB
+# to be scanned in two or more processes, smaller inputs are scanned in the process
+min_part_size = 256 * 1024
+
+# Pools of processes by their number of workers, a pool is started at the first large input and reused
+# by all lexers until the end of the program
+pools = {}
+
+
+def get_pool(workers) -> ProcessPoolExecutor:
+    """
+    It returns the pool of processes with the number of workers
+
+    :param workers: number of processes
+    """
+    if workers not in pools:
+        pools[workers] = ProcessPoolExecutor(workers)
+    return pools[workers]
+
+
+def split_source(data, parts) -> list:
+    """
+    It returns start positions of parts of the source, every part except the first one starts after a newline.
+    No token or comment of the language continues over the end of a line, so a newline always separates tokens
+    and the parts can be scanned independently.
+
+    :param data: source code
+    :param parts: wanted number of parts, fewer are returned if the source has not enough lines
+    """
+    starts = [0]
+    for i in range(1, parts):
+        newline = data.find("\n", max(len(data) * i // parts, starts[-1]))
+        if newline == -1:
+            break
+        if newline + 1 < len(data):
+            starts.append(newline + 1)
+    return starts
+
+
+# Lexer of a part of the source in a worker process, an illegal character is returned instead of being reported,
+# so it is reported when the parser gets to it
+class PartLexer(RegexLexer):
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.illegal = None
+
+    def illegal_character(self, character, lineno):
+        self.illegal = (character, lineno)
+
+
+def tokenize_part(part, lineno, offset) -> tuple:
+    """
+    It returns tokens of a part of the source as tuples (type, value, line number, position in the source),
+    the illegal character ending the part as a tuple (character, line number) or None
+    and the line number at the end of the part
+
+    :param part: part of the source code
+    :param lineno: line number of the start of the part
+    :param offset: position of the part in the source
+    """
+    lexer = PartLexer()
+    lexer.lineno = lineno
+    tokens = [(i.type, i.value, i.lineno, offset + i.lexpos) for i in lexer.generate_tokens((part,))]
+    return tokens, lexer.illegal, lexer.lineno
+
+
+# Lexer producing the same tokens as RegexLexer. A large input is split at newlines to parts that are scanned
+# in a pool of processes, the tokens of the parts are then given to the parser in order with line numbers
+# and positions counted from the start of the whole source. Small inputs are scanned without the pool.
+class ParallelLexer(RegexLexer):
+
+    def __init__(self, workers=None, part_size=min_part_size) -> None:
+        """
+        :param workers: number of processes, defaults to the number of CPUs (optional)
+        :param part_size: minimal number of characters in a part, defaults to min_part_size (optional)
+        """
+        super().__init__()
+        self.workers = workers or os.cpu_count() or 1
+        self.part_size = part_size
+
+    def input(self, data):
+        """
+        It starts scanning the new input, parts of a large input are sent to the pool right away
+
+        :param data: source code
+        """
+        parts = min(self.workers, len(data) // self.part_size)
+        if parts < 2:
+            super().input(data)
+            return
+        pool = get_pool(self.workers)
+        self.lexdata = data
+        starts = split_source(data, parts)
+        ends = starts[1:] + [len(data)]
+        results = []
+        lineno = self.lineno
+        for start, end in zip(starts, ends):
+            results.append(pool.submit(tokenize_part, data[start:end], lineno, start))
+            lineno += data.count("\n", start, end)
+        self.tokens = self.generate_part_tokens(results)
+
+    def generate_part_tokens(self, results):
+        """
+        It yields tokens of the parts in order, the line number of the lexer is updated at the end
+        or at an illegal character
+
+        :param results: futures of the results of tokenize_part
+        """
+        for result in results:
+            tokens, illegal, lineno = result.result()
+            for token_type, value, token_lineno, lexpos in tokens:
+                yield Token(token_type, value, token_lineno, lexpos)
+            if illegal is not None:
+                self.lineno = illegal[1]
+                for i in results:
+                    i.cancel()
+                self.illegal_character(*illegal)
+        self.lineno = lineno
@@ -0,0 +1,153 @@
+#  date: 19. 10. 2026
+#
+import re
+
+from src.lex_analyzer.lexer import reserved_set
+
+# Type of token of every keyword and symbol. Words starting with Int, Boolean, String, Array, true, false or Void
+# are split after the keyword like in the PLY lexer, eg. "Integer" is int_type followed by the identifier "eger".
+# Other words equal to a name of a token get the type of that token, the rest are identifiers.
+token_types = {name: name for name in reserved_set}
+token_types.update({
+    "Int": "int_type", "Boolean": "boolean_type", "String": "string_type", "Array": "array", "true": "bool",
+    "false": "bool", "Void": "Void",
+    "->": "arrow", ">=": "ge", "<=": "le", "+=": "add", "/=": "divby", "*=": "mulby", "-=": "sub",
+    "==": "equals_equals", "||": "or", "&&": "and", ",": "comma", ":": "ddot", "/": "divide",
+    "!": "exclamation_mark", ">": "gt", "<": "lt", "{": "lcparent", "}": "rcparent", "(": "lparent",
+    ")": "rparent", "[": "lsparent", "]": "rsparent", "*": "multiply", "+": "plus", "?": "question_mark",
+    '"': "quote", ";": "semicolon", "=": "equals", "-": "minus",
+})
+
+# One match is the skipped whitespace and comments followed by a word, an integer, a symbol, an illegal character
+# or the end of the input. Alternatives are ordered like the rules of the PLY lexer, so "-1" is an integer
+# and "!=" is ! followed by = (not_equal is never produced, same as in PLY).
+# The last two alternatives match anywhere, so the skipped part never backtracks.
+master_pattern = re.compile(r"""
+    ((?:[ \t\n]+|//[^\n]*)*)
+    (?:
+        (Int|Boolean|String|Array|true|false|Void|[A-Za-z][A-Za-z0-9_]*)
+        |(-?\d+)
+        |(->|>=|<=|\+=|/=|\*=|-=|==|\|\||&&|[,:/!><{}()\[\]*+?";=-])
+        |(.)
+        |\Z
+    )""", re.VERBOSE)
+
+
+# Token with the attributes the PLY parser reads
+class Token:
+    __slots__ = ("type", "value", "lineno", "lexpos", "lexer")
+
+    def __init__(self, token_type, value, lineno, lexpos) -> None:
+        self.type = token_type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+    def __repr__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+
+# size of chunks read from a file by input_file, tokens crossing the end of a chunk are completed from the next one
+chunk_size = 1 << 16
+
+
+# Lexer producing the same tokens as the PLY lexer built from lexer.py. The input is split by one compiled
+# regular expression with a group for every kind of token, types are looked up in a dictionary.
+# Tokens are made lazily when the parser asks for them, so they are not kept in memory all at once.
+# A file can be read in chunks, then the memory of the lexer is bounded by the chunk and not by the size of the file.
+# It has the interface the PLY parser uses.
+class RegexLexer:
+
+    def __init__(self) -> None:
+        self.lexdata = ""
+        self.lineno = 1
+        self.tokens = iter(())
+
+    def input(self, data):
+        """
+        It starts splitting the new input to tokens, the line number continues from the previous input like in PLY
+
+        :param data: source code
+        """
+        self.lexdata = data
+        self.tokens = self.generate_tokens((data,))
+
+    def input_file(self, file, size=chunk_size):
+        """
+        It starts splitting the opened file to tokens, the file is read in chunks while the tokens are consumed
+
+        :param file: file opened in text mode
+        :param size: number of characters in a chunk, defaults to chunk_size (optional)
+        """
+        self.lexdata = ""
+        self.tokens = self.generate_tokens(iter(lambda: file.read(size), ""))
+
+    def generate_tokens(self, chunks):
+        """
+        It yields tokens of the input, the line number of the lexer is updated at the end or at an illegal character.
+        A match reaching the end of a chunk can continue in the next one (eg. a word, -> or a comment),
+        so it is matched again together with the next chunk. Line numbers and positions are counted incrementally.
+
+        :param chunks: iterable of parts of the source code
+        """
+        get_type = token_types.get
+        lineno = self.lineno
+        # position of the buffer in the input
+        offset = 0
+        buffer = ""
+        chunks = iter(chunks)
+        chunk = next(chunks, "")
+        while True:
+            next_chunk = next(chunks, None)
+            buffer += chunk
+            # every scan of a buffer ends with a match reaching its end, it is complete only in the last chunk
+            incomplete_end = len(buffer) if next_chunk is not None else -1
+            for match in master_pattern.finditer(buffer):
+                if match.end() == incomplete_end:
+                    break
+                skipped, word, number, symbol, illegal = match.groups()
+                if skipped:
+                    lineno += skipped.count("\n")
+                if word:
+                    yield Token(get_type(word, "id"), word, lineno, offset + match.end(1))
+                elif number:
+                    yield Token("int", int(number), lineno, offset + match.end(1))
+                elif symbol:
+                    yield Token(token_types[symbol], symbol, lineno, offset + match.end(1))
+                else:
+                    self.lineno = lineno
+                    if illegal:
+                        self.illegal_character(illegal, lineno)
+                    return
+            offset += match.start()
+            buffer = buffer[match.start():]
+            chunk = next_chunk
+
+    def illegal_character(self, character, lineno):
+        """
+        It reports the illegal character like the PLY lexer, the scanning ends
+
+        :param character: the illegal character
+        :param lineno: line of the character
+        """
+        print(f"Syntax error: '{character}' at {lineno}")
+        raise Exception(f"Scanning error. Illegal character '{character}'")
+
+    def token(self):
+        """
+        It returns the next token or None at the end of the input.
+        The line number is the line of the returned token, as the PLY lexer counts lines lazily.
+        """
+        token = next(self.tokens, None)
+        if token is not None:
+            self.lineno = token.lineno
+        return token
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        token = self.token()
+        if token is None:
+            raise StopIteration
+        return token
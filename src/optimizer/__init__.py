@@ -0,0 +1,2 @@
+from src.optimizer.optimizer import max_optimization_level
+from src.optimizer.pass_manager import PassManager
@@ -0,0 +1,133 @@
+#  date: 19. 10. 2026
+#
+from src.optimizer.loop_invariant import all_integers
+from src.optimizer.utils import operator_roles, block_nodes, declaration_list_nodes, iter_preorder, \
+    is_safe_expression, get_identifiers, expression_key, make_identifier_node, replace_node, \
+    declare_temporary, get_written_names, get_function_writes
+
+# nodes chaining statements of one block, leaves of the chain are statements
+chain_nodes = (block_nodes | declaration_list_nodes | {"program", "variable_declaration", "function_declaration"}) \
+              - {"return_statement"}
+
+# statements that change the flow of the program, they end the basic block
+control_nodes = {"if_stmt", "if_else_stmt", "for_loop_block", "while_loop_block", "repeat_loop_block",
+                 "compound_block", "function_signature"}
+
+
+def get_statements(chain) -> list:
+    """
+    It returns statements of the block in the order of execution
+
+    :param chain: first node of the block
+    """
+    statements = []
+    stack = [chain]
+    while stack:
+        node = stack.pop()
+        if node.name in chain_nodes:
+            stack.extend(reversed([i for i in node.children if i.children]))
+        else:
+            statements.append(node)
+    return statements
+
+
+def get_nested_blocks(statement) -> list:
+    """
+    It returns blocks nested in the control statement
+
+    :param statement: control statement
+    """
+    blocks = []
+    stack = [statement]
+    while stack:
+        node = stack.pop()
+        if node.name == "compound_block":
+            blocks.append(node.children[0])
+            continue
+        stack.extend(node.children)
+    return blocks
+
+
+def get_basic_blocks(root) -> list:
+    """
+    It splits the program to sequences of statements without jumps
+
+    :param root: root of the tree
+    :return: list of lists of statements
+    """
+    basic_blocks = []
+    chains = [root]
+    while chains:
+        chain = chains.pop()
+        statements = []
+        for statement in get_statements(chain):
+            if statement.name in control_nodes:
+                # condition of the if statement is evaluated before the jump
+                if statement.name == "if_stmt" or statement.name == "if_else_stmt":
+                    statements.append(statement.children[0])
+                basic_blocks.append(statements)
+                statements = []
+                chains.extend(get_nested_blocks(statement))
+            else:
+                statements.append(statement)
+        basic_blocks.append(statements)
+    return basic_blocks
+
+
+def find_common_expressions(statements, function_writes) -> list:
+    """
+    It numbers values of expressions in the basic block, expressions with the same number
+    are computed only once
+
+    :param statements: statements of the basic block
+    :param function_writes: names written by every function
+    :return: list of lists of expression nodes with the same value
+    """
+    available = {}
+    groups = []
+    for statement in statements:
+        for node in iter_preorder(statement):
+            if node.name in operator_roles and is_safe_expression(node):
+                key = expression_key(node)
+                if key not in available:
+                    if not all_integers(node):
+                        continue
+                    available[key] = []
+                    groups.append(available[key])
+                available[key].append((statement, node))
+        # the statement reads its operands before it writes the result
+        written = get_written_names(statement, function_writes)
+        for key in [i for i in available if written & get_identifiers(available[i][0][1])]:
+            del available[key]
+    return groups
+
+
+def eliminate_common_subexpressions(dst, symbol_table) -> int:
+    """
+    It computes expression used more times in a basic block only once,
+    its value is stored to a new variable before the first use. The variable is declared there, or at the start
+    of the function (or of the program) if the basic block is not always executed.
+
+    :param dst: syntax tree
+    :param symbol_table: table of symbols of the tree
+    :return: number of eliminated expressions
+    """
+    function_writes = get_function_writes(dst)
+    groups = []
+    for statements in get_basic_blocks(dst):
+        groups += [i for i in find_common_expressions(statements, function_writes) if len(i) > 1]
+    # the largest expressions go first, their subexpressions are gone after the rewrite
+    groups.sort(key=lambda i: -len(list(iter_preorder(i[0][1]))))
+    removed = set()
+    eliminated = 0
+    for group in groups:
+        group = [i for i in group if i[1] not in removed]
+        if len(group) < 2:
+            continue
+        name = "_cse" + str(eliminated)
+        for _, node in group:
+            removed.update(iter_preorder(node))
+            replace_node(node, make_identifier_node(name, operator_roles[node.name], lineno=node.lineno))
+        declare_temporary(group[0][0], name, "Int", group[0][1])
+        eliminated += 1
+    return eliminated
@@ -0,0 +1,121 @@
+#  date: 19. 10. 2026
+#
+import src.pl0_code_generator as gen
+from src.optimizer.utils import iter_preorder, get_identifiers, get_written_names, replace_node, make_value_node
+from src.pl0_vm.p_machine import evaluate_function
+from src.syntax_analyzer.symbol_table import generate_table_of_symbols
+
+# number of instructions one evaluated call can execute, longer calls are left for the run time
+max_evaluation_steps = 10000
+
+
+def get_declared_names(record) -> set:
+    """
+    It returns names of parameters and local variables of the function
+
+    :param record: symbol record of the function
+    """
+    names = set(record.params or {})
+    for scope in record.locals or []:
+        names |= set(scope)
+    return names
+
+
+def find_pure_functions(dst, symbol_table) -> set:
+    """
+    It finds functions returning integer whose result depends only on their arguments.
+    Such function reads and writes only its parameters and locals and calls only pure functions.
+
+    :param dst: syntax tree
+    :param symbol_table: table of symbols of the tree
+    :return: names of pure functions
+    """
+    global_names = {i for i in symbol_table if i != "_scopes"}
+    calls = {}
+    for signature in iter_preorder(dst):
+        if signature.name != "function_signature":
+            continue
+        name = signature.children[0].name
+        record = symbol_table[name]
+        body = signature.children[3]
+        declared = get_declared_names(record)
+        used = get_identifiers(body) | get_written_names(body)
+        # locals hiding globals are not told apart from the globals by name
+        if record.return_type != "Int" or not used <= declared or used & global_names - set(record.params or {}) \
+                or any(i.name == "function_signature" for i in iter_preorder(body)):
+            continue
+        calls[name] = {i.children[0].name for i in iter_preorder(body) if i.name == "function_call"}
+    pure = set(calls)
+    changed = True
+    while changed:
+        impure = {name for name in pure if not calls[name] <= pure}
+        pure -= impure
+        changed = len(impure) > 0
+    return pure
+
+
+def get_literal_arguments(call):
+    """
+    It returns values of arguments of the call if all of them are integer literals
+
+    :param call: function_call node
+    :return: list of integers or None
+    """
+    arguments = []
+    node = call.children[1]
+    while node is not None:
+        value = node.children[0]
+        if node.name == "argument" and not value.children:
+            # call without arguments
+            break
+        if value.name != "var_value":
+            return None
+        arguments.append(value.children[0].name)
+        node = node.children[1] if node.name == "arguments_list" else None
+    return arguments
+
+
+def compile_functions(dst):
+    """
+    It generates code of a copy of the tree, so functions can be run before the tree is compiled
+
+    :param dst: syntax tree
+    :return: generated instructions and addresses of functions
+    """
+    dst_copy = dst.copy()
+    symbol_table = {}
+    generate_table_of_symbols(symbol_table, dst_copy)
+    generated_code = gen.Pl0(dst_copy, symbol_table)
+    generated_code.generate_instructions()
+    addresses = {name: record.address for name, record in symbol_table.items()
+                 if name != "_scopes" and record.type == "func"}
+    return generated_code.code, addresses
+
+
+def evaluate_constant_calls(dst, symbol_table) -> int:
+    """
+    It replaces calls of pure functions with literal arguments by the value they return.
+    The function is run in the PL/0 machine with limited number of steps.
+
+    :param dst: syntax tree
+    :param symbol_table: table of symbols of the tree
+    :return: number of evaluated calls
+    """
+    pure = find_pure_functions(dst, symbol_table)
+    calls = []
+    for call in iter_preorder(dst):
+        if call.name == "function_call" and call.children[0].name in pure:
+            arguments = get_literal_arguments(call)
+            if arguments is not None:
+                calls.append((call, arguments))
+    if not calls:
+        return 0
+    code, addresses = compile_functions(dst)
+    evaluated = 0
+    for call, arguments in calls:
+        result = evaluate_function(code, addresses[call.children[0].name], arguments, max_evaluation_steps)
+        if result is None:
+            continue
+        replace_node(call, make_value_node("var_value", [result], call.lineno))
+        evaluated += 1
+    return evaluated
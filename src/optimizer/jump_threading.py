@@ -0,0 +1,136 @@
+#  date: 19. 10. 2026
+#
+from src.pl0_code_generator.instructions import Inst
+from src.pl0_code_generator.ir import label_instruction, jump_instructions
+
+
+def get_label_positions(instructions) -> dict:
+    """
+    It maps labels to indexes of their pseudo instructions
+
+    :param instructions: instructions of the intermediate representation
+    """
+    return {i[2]: index for index, i in enumerate(instructions) if i[0] == label_instruction}
+
+
+def get_successors(instructions, positions, index) -> list:
+    """
+    It returns indexes of instructions that can be executed right after the instruction
+
+    :param instructions: instructions of the intermediate representation
+    :param positions: indexes of labels
+    :param index: index of the instruction
+    """
+    name, _, param = instructions[index]
+    if name == Inst.ret.value:
+        return []
+    if name == Inst.jmp.value:
+        return [positions[param]]
+    # conditional jump falls through when the condition holds, call continues after the return
+    if name in jump_instructions:
+        return [positions[param], index + 1]
+    return [index + 1]
+
+
+def find_reachable(instructions, positions) -> set:
+    """
+    It walks the control flow graph from the first instruction and returns indexes of all reachable instructions
+
+    :param instructions: instructions of the intermediate representation
+    :param positions: indexes of labels
+    """
+    reachable = set()
+    stack = [0]
+    while stack:
+        index = stack.pop()
+        if index in reachable or index >= len(instructions):
+            continue
+        reachable.add(index)
+        stack.extend(get_successors(instructions, positions, index))
+    return reachable
+
+
+def skip_labels(instructions, index) -> int:
+    """
+    It returns index of the first instruction at or after the index that is not a label
+
+    :param instructions: instructions of the intermediate representation
+    :param index: index in the instructions
+    """
+    while index < len(instructions) and instructions[index][0] == label_instruction:
+        index += 1
+    return index
+
+
+def get_target(instructions, positions, label) -> int:
+    """
+    It returns index of the first instruction executed after a jump to the label
+
+    :param instructions: instructions of the intermediate representation
+    :param positions: indexes of labels
+    :param label: target of a jump
+    """
+    return skip_labels(instructions, positions[label])
+
+
+def get_final_label(instructions, positions, label):
+    """
+    It follows the chain of unconditional jumps starting at the label to the first other instruction
+
+    :param instructions: instructions of the intermediate representation
+    :param positions: indexes of labels
+    :param label: target of a jump
+    """
+    visited = set()
+    while label not in visited:
+        visited.add(label)
+        index = get_target(instructions, positions, label)
+        if index >= len(instructions) or instructions[index][0] != Inst.jmp.value:
+            break
+        label = instructions[index][2]
+    return label
+
+
+def retarget_jumps(instructions, positions) -> int:
+    """
+    It makes every jump go directly to the final destination of the jump chain
+
+    :param instructions: instructions of the intermediate representation
+    :param positions: indexes of labels
+    :return: number of retargeted jumps
+    """
+    retargeted = 0
+    for instruction in instructions:
+        if instruction[0] == Inst.jmp.value or instruction[0] == Inst.jmc.value:
+            label = get_final_label(instructions, positions, instruction[2])
+            if label != instruction[2]:
+                instruction[2] = label
+                retargeted += 1
+    return retargeted
+
+
+def thread_jumps(ir) -> int:
+    """
+    It retargets jumps to jumps to their final destination and removes jumps that became dead,
+    ie. unreachable jumps and jumps to the next instruction. Other unreachable instructions are removed too.
+
+    :param ir: intermediate representation of the program
+    :return: number of changed instructions
+    """
+    instructions = ir.instructions
+    changed = 0
+    while True:
+        positions = get_label_positions(instructions)
+        retargeted = retarget_jumps(instructions, positions)
+        reachable = find_reachable(instructions, positions)
+        removed = set()
+        for index, (name, _, param) in enumerate(instructions):
+            if name == label_instruction:
+                continue
+            if index not in reachable or (name == Inst.jmp.value and get_target(instructions, positions, param) ==
+                                          skip_labels(instructions, index + 1)):
+                removed.add(index)
+        if not retargeted and not removed:
+            return changed
+        instructions[:] = [i for index, i in enumerate(instructions) if index not in removed]
+        changed += retargeted + len(removed)
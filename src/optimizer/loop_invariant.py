@@ -0,0 +1,88 @@
+#  date: 19. 10. 2026
+#
+from src.optimizer.utils import operator_roles, is_safe_expression, get_identifiers, \
+    expression_key, make_identifier_node, replace_node, declare_temporary, get_written_names, \
+    get_function_writes, iter_preorder
+
+loop_nodes = {"for_loop_block", "while_loop_block", "repeat_loop_block"}
+
+
+def find_loops(root) -> list:
+    """
+    It returns all loops in preorder (outer loops first)
+
+    :param root: root of the tree
+    """
+    return [i for i in iter_preorder(root) if i.name in loop_nodes]
+
+
+def get_loop_parts(loop) -> list:
+    """
+    It returns the subtrees of the loop that are evaluated in every iteration
+
+    :param loop: loop node
+    """
+    if loop.name == "for_loop_block":
+        return [loop.children[1], loop.children[3]]
+    return list(loop.children)
+
+
+def find_invariant_expressions(loop, written) -> list:
+    """
+    It finds the largest expressions in the loop whose operands are not changed in the loop
+
+    :param loop: loop node
+    :param written: names of identifiers changed in the loop
+    """
+    invariants = []
+    for part in get_loop_parts(loop):
+        stack = [part]
+        while stack:
+            node = stack.pop()
+            # nested functions have their own stack frame
+            if node.name == "function_signature":
+                continue
+            if node.name in operator_roles and is_safe_expression(node):
+                identifiers = get_identifiers(node)
+                if identifiers and not identifiers & written and all_integers(node):
+                    invariants.append(node)
+                    continue
+            stack.extend(reversed(node.children))
+    return invariants
+
+
+def all_integers(node) -> bool:
+    """
+    It checks that the expression and all values in it are integers by types stored in the tree by annotate_types.
+    Nodes made by the passes have no type until the types are stored again.
+
+    :param node: root of the expression subtree
+    """
+    return all(i.dtype == "Int" for i in iter_preorder(node) if i.children)
+
+
+def hoist_loop_invariants(dst, symbol_table) -> int:
+    """
+    It moves expressions that give the same value in every iteration of the loop in front of the loop.
+    Value of the expression is stored to a new variable and the loop only loads it. The variable is declared
+    in front of the loop, or at the start of the function (or of the program) if the loop is not always executed.
+
+    :param dst: syntax tree
+    :param symbol_table: table of symbols of the tree
+    :return: number of hoisted expressions
+    """
+    function_writes = get_function_writes(dst)
+    hoisted = 0
+    for loop in find_loops(dst):
+        written = get_written_names(loop, function_writes)
+        # same expression used more times in the loop is computed only once
+        groups = {}
+        for node in find_invariant_expressions(loop, written):
+            groups.setdefault(expression_key(node), []).append(node)
+        for nodes in groups.values():
+            name = "_licm" + str(hoisted)
+            for node in nodes:
+                replace_node(node, make_identifier_node(name, operator_roles[node.name], lineno=node.lineno))
+            declare_temporary(loop, name, "Int", nodes[0])
+            hoisted += 1
+    return hoisted
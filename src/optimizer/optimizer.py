@@ -0,0 +1,26 @@
+#  date: 19. 10. 2026
+#
+
+# the highest supported optimization level
+max_optimization_level = 3
+
+
+def get_tree_passes() -> list:
+    """
+    It returns passes over the semantically checked tree in the order they are run, with the lowest level
+    they are run at. Modules of the passes are imported at the first call, so a compilation without
+    optimizations does not load them.
+    """
+    from src.optimizer.common_subexpression import eliminate_common_subexpressions
+    from src.optimizer.function_evaluation import evaluate_constant_calls
+    from src.optimizer.loop_invariant import hoist_loop_invariants
+    return [(3, evaluate_constant_calls), (1, eliminate_common_subexpressions), (1, hoist_loop_invariants)]
+
+
+def get_ir_passes() -> list:
+    """
+    It returns passes over the intermediate representation in the order they are run, with the lowest level
+    they are run at. Modules of the passes are imported at the first call.
+    """
+    from src.optimizer.jump_threading import thread_jumps
+    return [(2, thread_jumps)]
@@ -0,0 +1,81 @@
+#  date: 19. 10. 2026
+#
+import time
+
+from src.optimizer.optimizer import get_tree_passes, get_ir_passes
+from src.optimizer.utils import iter_preorder
+from src.syntax_analyzer.symbol_table import generate_table_of_symbols
+
+
+# It runs passes enabled at the optimization level in order and records how long each pass took
+# and how much it changed the tree or the intermediate representation.
+class PassManager:
+
+    def __init__(self, optimization_level=0) -> None:
+        """
+        :param optimization_level: 0 runs no passes, higher levels enable more passes
+        """
+        self.optimization_level = optimization_level
+        # tuples (name of the pass, seconds, number of changes, size before, size after)
+        self.reports = []
+
+    def get_passes(self, get_all_passes) -> list:
+        """
+        It returns passes enabled at the optimization level, no pass is loaded at the level 0
+
+        :param get_all_passes: function returning list of tuples (lowest level, pass)
+        """
+        if self.optimization_level == 0:
+            return []
+        return [optimization for level, optimization in get_all_passes() if level <= self.optimization_level]
+
+    def run_pass(self, optimization, program, size_of) -> int:
+        """
+        It runs the pass and records its report
+
+        :param optimization: function changing the program and returning the number of changes
+        :param program: arguments of the pass
+        :param size_of: function measuring the size of the program
+        """
+        size_before = size_of()
+        start = time.perf_counter()
+        changes = optimization(*program)
+        duration = time.perf_counter() - start
+        self.reports.append((optimization.__name__, duration, changes, size_before, size_of()))
+        return changes
+
+    def run_tree_passes(self, dst, symbol_table):
+        """
+        It runs passes over the semantically checked syntax tree.
+        Passes can declare new variables, so the table of symbols is generated and identifiers are bound
+        again after every change. Passes store types of the values they make, checked types are kept.
+
+        :param dst: syntax tree
+        :param symbol_table: table of symbols of the tree
+        :return: table of symbols of the optimized tree
+        """
+        for optimization in self.get_passes(get_tree_passes):
+            if self.run_pass(optimization, (dst, symbol_table), lambda: sum(1 for _ in iter_preorder(dst))) > 0:
+                symbol_table = {}
+                generate_table_of_symbols(symbol_table, dst)
+        return symbol_table
+
+    def run_ir_passes(self, ir):
+        """
+        It runs passes over the intermediate representation, the representation is changed in place
+
+        :param ir: intermediate representation of the program
+        """
+        for optimization in self.get_passes(get_ir_passes):
+            self.run_pass(optimization, (ir,), ir.size)
+
+    def get_report(self) -> str:
+        """
+        It returns a table with time and changes of every run pass
+        """
+        report = "optimization level: " + str(self.optimization_level) + "\n"
+        report += "pass\ttime [ms]\tchanges\tsize before\tsize after\n"
+        for name, duration, changes, size_before, size_after in self.reports:
+            report += name + "\t" + format(duration * 1000, ".3f") + "\t" + str(changes) + "\t" + \
+                str(size_before) + "\t" + str(size_after) + "\n"
+        return report
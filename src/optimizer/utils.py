@@ -0,0 +1,339 @@
+#  date: 19. 10. 2026
+#
+from src.syntax_analyzer.utils import make_node
+
+# operator nodes of arithmetic expressions mapped to the grammar symbol they were reduced from
+operator_roles = {"expression_sum": "expression", "expression_minus": "expression",
+                  "expression_multiply": "term", "expression_divide": "term",
+                  "unary_minus": "factor"}
+
+# nodes that only wrap a single sub expression
+wrapper_nodes = {"expression_term", "factor", "factor_expression", "expression_in_parent"}
+
+# nodes with literal value as a leaf
+literal_nodes = {"var_value", "var_value_boolean", "const_expression_term"}
+
+# nodes that change value of the identifier stored in the first child
+writing_nodes = {"var_modification", "array_var_modification", "loop_step", "var_declaration",
+                 "var_declaration_expression", "parameter_declaration", "parameters_declaration_list"}
+
+# productions of the block symbol
+block_nodes = {"block", "block_var_dekl", "block_expression", "block_statement", "return_statement"}
+
+# productions of the dekl_list symbol
+declaration_list_nodes = {"declaration_list", "declaration", "statement", "var_modification_dekl"}
+
+# operators whose operands can be swapped
+commutative_operators = {"expression_sum", "expression_multiply"}
+
+
+def iter_preorder(node, skip=None):
+    """
+    It yields nodes of the subtree in preorder without materializing the whole subtree
+
+    :param node: root of the subtree
+    :param skip: names of nodes whose children are not visited
+    """
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+        if skip is None or current.name not in skip:
+            stack.extend(reversed(current.children))
+
+
+def is_safe_expression(node) -> bool:
+    """
+    It checks that the expression has no side effects and can not fail, so it can be evaluated
+    at different place (or only once) without changing the behaviour of the program
+
+    :param node: root of the expression subtree
+    """
+    for i in iter_preorder(node):
+        if not i.children:
+            continue
+        if i.name == "expression_divide":
+            divisor = i.children[1].get_leaf_names()
+            # division by zero must happen only where the programmer wrote it
+            if len(divisor) != 1 or type(divisor[0]) is not int or divisor[0] == 0:
+                return False
+        elif i.name not in operator_roles and i.name not in wrapper_nodes and i.name not in literal_nodes \
+                and i.name != "var_value_identifier":
+            return False
+    return True
+
+
+def get_identifiers(node) -> set:
+    """
+    It returns names of all identifiers read in the expression
+
+    :param node: root of the expression subtree
+    """
+    return {i.children[0].name for i in iter_preorder(node) if i.name == "var_value_identifier"}
+
+
+def expression_key(node):
+    """
+    It returns a hashable value describing the expression, structurally equal expressions share the key.
+    Wrapping nodes are ignored and operands of commutative operators are ordered.
+
+    :param node: root of the expression subtree
+    """
+    while node.name in wrapper_nodes:
+        node = node.children[0]
+    if node.name in literal_nodes:
+        return "lit", node.children[0].name
+    if node.name == "var_value_identifier":
+        return "id", node.children[0].name
+    if node.name == "unary_minus":
+        return "neg", expression_key(node.children[1])
+    operands = [expression_key(node.children[0]), expression_key(node.children[1])]
+    if node.name in commutative_operators:
+        operands.sort(key=repr)
+    return (node.name,) + tuple(operands)
+
+
+def make_value_node(node_name, children, lineno=-1, dtype="Int"):
+    """
+    It makes a node of a value with its type, as the semantic analysis would store it
+
+    :param node_name: name of the node
+    :param children: children of the node
+    :param lineno: number of line of the statement
+    :param dtype: type of the value
+    """
+    node = make_node(node_name, children, lineno=lineno)
+    node.dtype = dtype
+    return node
+
+
+def make_identifier_node(name, role, lineno=-1, dtype="Int"):
+    """
+    It makes a subtree that loads the identifier and has the same shape as the parser would produce
+    at the place of given grammar symbol
+
+    :param name: name of the identifier
+    :param role: grammar symbol - expression, term or factor
+    :param lineno: number of line of the statement
+    :param dtype: type of the identifier
+    """
+    node = make_value_node("factor_expression", [make_value_node("var_value_identifier", [name], lineno, dtype)],
+                           lineno, dtype)
+    if role == "factor":
+        return node
+    node = make_value_node("factor", [node], lineno, dtype)
+    if role == "term":
+        return node
+    return make_value_node("expression_term", [node], lineno, dtype)
+
+
+def wrap_as_expression(node):
+    """
+    It wraps the operator node, so it can be used where the grammar expects an expression
+
+    :param node: operator node
+    """
+    role = operator_roles[node.name]
+    if role == "factor":
+        node = make_value_node("factor", [node], node.lineno, node.dtype)
+        role = "term"
+    if role == "term":
+        node = make_value_node("expression_term", [node], node.lineno, node.dtype)
+    return node
+
+
+def replace_node(old, new):
+    """
+    It puts the new node to the place of the old one
+
+    :param old: node in the tree
+    :param new: detached node
+    """
+    parent = old.up
+    parent.children[parent.children.index(old)] = new
+    new.up = parent
+    old.up = None
+
+
+def make_literal_expression(value, lineno=-1):
+    """
+    It makes an expression subtree with the integer literal
+
+    :param value: integer value
+    :param lineno: number of line of the statement
+    """
+    node = make_value_node("factor_expression", [make_value_node("var_value", [value], lineno)], lineno)
+    return make_value_node("expression_term", [make_value_node("factor", [node], lineno)], lineno)
+
+
+def insert_declaration_before(statement, name, data_type, expression):
+    """
+    It declares a new variable initialized with the expression just before the statement.
+    The nearest block (or declaration list) containing the statement is wrapped by the variable declaration.
+
+    :param statement: node of the statement
+    :param name: name of the new variable
+    :param data_type: data type of the new variable
+    :param expression: detached operator node
+    """
+    container = statement
+    while container.name not in block_nodes and container.name not in declaration_list_nodes:
+        container = container.up
+    lineno = expression.lineno
+    declaration = make_node("var_declaration_expression",
+                            [name, make_node("data_type", [data_type], lineno=lineno)], lineno=lineno)
+    declaration.add_child(wrap_as_expression(expression))
+    parent = container.up
+    index = parent.children.index(container)
+    container.detach()
+    if container.name in block_nodes:
+        # block : var var_dekl dekl_list, where dekl_list : block
+        wrapper = make_node("block_var_dekl", ["var", declaration], lineno=container.lineno)
+        wrapper.add_child(make_node("declaration", [container], lineno=container.lineno))
+    else:
+        # dekl_list : dekl dekl_list, where dekl : var var_dekl
+        wrapper = make_node("declaration_list", [make_node("variable_declaration", ["var", declaration],
+                                                           lineno=lineno)], lineno=container.lineno)
+        wrapper.add_child(container)
+    parent.children.insert(index, wrapper)
+    wrapper.up = parent
+
+
+def is_executed_with_frame(node) -> bool:
+    """
+    It checks that the node is executed whenever its function (or the program) is, so it is not
+    in a branch or in a body of a loop
+
+    :param node: node in the tree
+    """
+    while node.up is not None and node.name != "function_signature":
+        # compound blocks are bodies of functions, branches and loops or nested blocks
+        if node.name == "compound_block" and node.up.name not in ("function_signature", "block"):
+            return False
+        node = node.up
+    return True
+
+
+def declare_temporary(statement, name, data_type, expression):
+    """
+    It declares a new variable holding value of the expression computed just before the statement.
+    Variables have static addresses in the frame, so a statement that is not always executed gets
+    the declaration at the start of the frame and only the assignment in front of it.
+
+    :param statement: node of the statement
+    :param name: name of the new variable
+    :param data_type: data type of the new variable
+    :param expression: detached operator node
+    """
+    if is_executed_with_frame(statement):
+        insert_declaration_before(statement, name, data_type, expression)
+    else:
+        declare_at_frame_entry(statement, name, data_type)
+        insert_assignment_before(statement, name, expression)
+
+
+def declare_at_frame_entry(node, name, data_type):
+    """
+    It declares a new variable initialized with zero at the start of the function containing the node
+    (or of the program). Variables have static addresses in the frame, so the declaration must be executed
+    before any variable declared after it, which is not true for declarations in conditional code.
+
+    :param node: node in the tree
+    :param name: name of the new variable
+    :param data_type: data type of the new variable
+    """
+    frame = node
+    while frame.up is not None and frame.name != "function_signature":
+        frame = frame.up
+    lineno = frame.lineno
+    declaration = make_node("var_declaration_expression",
+                            [name, make_node("data_type", [data_type], lineno=lineno),
+                             make_literal_expression(0, lineno)], lineno=lineno)
+    if frame.name == "function_signature":
+        # the body of the function is compound_block containing a block
+        parent = frame.children[3]
+        container = parent.children[0]
+        container.detach()
+        # block : var var_dekl dekl_list, where dekl_list : block
+        wrapper = make_node("block_var_dekl", ["var", declaration], lineno=lineno)
+        wrapper.add_child(make_node("declaration", [container], lineno=lineno))
+    else:
+        parent = frame
+        container = parent.children[0]
+        container.detach()
+        # dekl_list : dekl dekl_list, where dekl : var var_dekl
+        wrapper = make_node("declaration_list", [make_node("variable_declaration", ["var", declaration],
+                                                           lineno=lineno)], lineno=lineno)
+        wrapper.add_child(container)
+    parent.children.insert(0, wrapper)
+    wrapper.up = parent
+
+
+def insert_assignment_before(statement, name, expression):
+    """
+    It assigns the expression to the variable just before the statement.
+    The nearest block (or declaration list) containing the statement is wrapped by the assignment.
+
+    :param statement: node of the statement
+    :param name: name of the variable
+    :param expression: detached operator node
+    """
+    container = statement
+    while container.name not in block_nodes and container.name not in declaration_list_nodes:
+        container = container.up
+    lineno = expression.lineno
+    assignment = make_node("var_modification", [name, "="], lineno=lineno)
+    assignment.add_child(wrap_as_expression(expression))
+    parent = container.up
+    index = parent.children.index(container)
+    container.detach()
+    if container.name in block_nodes:
+        # block : var_modification semicolon dekl_list, where dekl_list : block
+        wrapper = make_node("block_expression", [assignment], lineno=container.lineno)
+        wrapper.add_child(make_node("declaration", [container], lineno=container.lineno))
+    else:
+        # dekl_list : var_modification semicolon dekl_list
+        wrapper = make_node("var_modification_dekl", [assignment, container], lineno=container.lineno)
+    parent.children.insert(index, wrapper)
+    wrapper.up = parent
+
+
+def get_written_names(node, function_writes=None) -> set:
+    """
+    It returns names of all identifiers whose value can be changed in the subtree
+
+    :param node: root of the subtree
+    :param function_writes: names written by every function, calls are ignored if None
+    """
+    written = set()
+    for i in iter_preorder(node):
+        if i.name in writing_nodes:
+            written.add(i.children[0].name)
+        elif i.name == "function_call" and function_writes is not None:
+            written |= function_writes.get(i.children[0].name, set())
+    return written
+
+
+def get_function_writes(root) -> dict:
+    """
+    It maps every function to names it can write, including writes of functions called from it
+
+    :param root: root of the tree
+    """
+    writes = {}
+    calls = {}
+    for i in iter_preorder(root):
+        if i.name == "function_signature":
+            name = i.children[0].name
+            writes[name] = get_written_names(i.children[3])
+            calls[name] = {j.children[0].name for j in iter_preorder(i.children[3]) if j.name == "function_call"}
+    changed = True
+    while changed:
+        changed = False
+        for name in writes:
+            for called in calls[name]:
+                missing = writes.get(called, set()) - writes[name]
+                if missing:
+                    writes[name] |= missing
+                    changed = True
+    return writes
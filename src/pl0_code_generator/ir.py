@@ -0,0 +1,69 @@
+#  date: 19. 10. 2026
+#
+from src.pl0_code_generator.instructions import Inst
+
+# pseudo instruction marking the place of a label, it is not emitted
+label_instruction = "LABEL"
+
+# instructions whose parameter is a label
+jump_instructions = {Inst.jmp.value, Inst.jmc.value, Inst.cal.value}
+
+
+# Stack based intermediate representation between the syntax tree and PL/0 code.
+# Instructions are PL/0 instructions, but jumps and calls refer to labels instead of addresses,
+# so passes can add, remove and move instructions without fixing addresses.
+class Ir:
+
+    def __init__(self) -> None:
+        self.instructions = []
+
+    def append(self, inst_name, param1, param2):
+        """
+        It appends an instruction to the end of the program
+
+        :param inst_name: The name of the instruction
+        :param param1: the first parameter of the instruction
+        :param param2: the second parameter of the instruction, label for jumps and calls
+        """
+        self.instructions.append([inst_name, param1, param2])
+
+    def place_label(self, label):
+        """
+        It places the label in front of the next appended instruction
+
+        :param label: name of the label
+        """
+        self.instructions.append([label_instruction, 0, label])
+
+    def size(self) -> int:
+        """
+        It returns the number of instructions without labels
+        """
+        return sum(1 for i in self.instructions if i[0] != label_instruction)
+
+    def get_label_addresses(self) -> dict:
+        """
+        It returns addresses the labels point to in the emitted code
+        """
+        addresses = {}
+        address = 0
+        for name, _, param in self.instructions:
+            if name == label_instruction:
+                addresses[param] = address
+            else:
+                address += 1
+        return addresses
+
+    def lower(self) -> list:
+        """
+        It emits PL/0 code, labels are replaced by addresses of instructions they point to
+        """
+        addresses = self.get_label_addresses()
+        code = []
+        for name, param1, param2 in self.instructions:
+            if name == label_instruction:
+                continue
+            if name in jump_instructions:
+                param2 = addresses[param2]
+            code.append([name, param1, param2])
+        return code
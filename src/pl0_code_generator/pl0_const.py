@@ -10,10 +10,12 @@ class Pl0Const:
 
         self.types = [int]
 
+        # Types of values stored on the stack of the PL/0 machine, booleans are stored as 0 and 1.
+        self.value_types = {"Int", "Boolean"}
+
         # A dictionary that maps the operators to the functions that generate the code for the operators.
-        self.expressions = {"expression_sum": self.gen_opr_add, "expression_minus": self.gen_opr_sub,
-                            "expression_multiply": self.gen_opr_mul, "expression_divide": self.gen_opr_div,
-                            "expression_term": self.gen_term, "const_expression_term": self.gen_term}
+        self.operators = {"expression_sum": self.gen_add, "expression_minus": self.gen_sub,
+                          "expression_multiply": self.gen_mulby, "expression_divide": self.gen_divby}
 
         # A dictionary that maps the operators to the functions that generate the code for the operators.
         self.var_modifications = {"-=": self.gen_sub, "+=": self.gen_add, "*=": self.gen_mulby,
@@ -23,6 +25,9 @@ class Pl0Const:
         self.cond_expressions = {"<": self.gen_lesser, "!=": self.gen_not_equal, "<=": self.gen_lesser_equals,
                                  ">": self.gen_greater, ">=": self.gen_greater_equals, "==": self.gen_dos_equals, }
 
+        # A dictionary that maps the relational operators to the operators with opposite result.
+        self.negated_relations = {"<": ">=", ">=": "<", ">": "<=", "<=": ">", "==": "!=", "!=": "=="}
+
     def gen_lesser(self):
         """
         It returns a list of all the numbers in the range of the input number that are less than the input number
@@ -102,50 +107,3 @@ class Pl0Const:
         does nothing
         """
         pass
-
-    def gen_term(self, operator):
-        """
-        It adds two numbers.
-
-        :param const1: The first constant to add
-        :param const2: The second constant to add to the first
-        """
-        raise NotImplementedError("Method not yet implemented.")
-
-    def gen_opr_add(self, const1, const2):
-        """
-        It adds two numbers.
-
-        :param const1: The first constant to add
-        :param const2: The second constant to add to the first
-        """
-        raise NotImplementedError("Method not yet implemented.")
-
-    def gen_opr_sub(self, const1, const2):
-        """
-        It subtracts two numbers.
-
-        :param const1: The first constant to be used in the operation
-        :param const2: The constant to be subtracted from
-        """
-        raise NotImplementedError("Method not yet implemented.")
-
-    def gen_opr_mul(self, const1, const2):
-        """
-        It generates a new constant
-        that is the product of two other constants
-
-        :param const1: The first constant to be multiplied
-        :param const2: The second constant to be multiplied
-        """
-        raise NotImplementedError("Method not yet implemented.")
-
-    def gen_opr_div(self, const1, const2):
-        """
-        It divides two numbers.
-
-        :param const1: The first constant to be used in the operation
-        :param const2: The constant to divide by
-        """
-        raise NotImplementedError("Method not yet implemented.")
-
@@ -3,24 +3,26 @@
 #
 from copy import copy
 
-from ete3 import Tree
-
 from src.pl0_code_generator.instructions import Inst, Op
+from src.pl0_code_generator.ir import Ir
 from src.pl0_code_generator.pl0_const import Pl0Const
+from src.syntax_analyzer.ast_node import AstNode
 from src.syntax_analyzer.symbol_record import SymbolRecord
 from src.syntax_analyzer.symbol_table import find_entry_in_symbol_table
 
 
 class Pl0Parent(Pl0Const):
 
-    def __init__(self, abstract_syntax_tree: Tree, symbol_table) -> None:
+    def __init__(self, abstract_syntax_tree: AstNode, symbol_table) -> None:
         """
         The function takes in an abstract syntax tree and initializes the code, ast, and stck attributes.
 
         :param abstract_syntax_tree: This is the abstract syntax tree that was generated by the parser
-        :type abstract_syntax_tree: Tree
+        :type abstract_syntax_tree: AstNode
         """
         super().__init__()
+        # intermediate representation of the program, it is lowered to the code at the end
+        self.ir = Ir()
         self.code = []
         self.ast = abstract_syntax_tree
         self.symbol_table = symbol_table
@@ -28,16 +30,19 @@ class Pl0Parent(Pl0Const):
         # [JT] current scope in the tree, ie if we are in global scope (0) or in function scope (<id>)
         # used for symbol table navigation
         self.current_scope = 0
+        self.label_count = 0
+        # labels of the first instructions of functions
+        self.function_labels = {}
 
     def generate_instruction(self, inst_name, param1, param2):
         """
-        It appends a list of three elements to the list called code
+        It appends the instruction to the intermediate representation
 
         :param inst_name: The name of the instruction
         :param param1: the first parameter of the instruction
         :param param2: the value of the second parameter
         """
-        self.code.append([inst_name, param1, param2])
+        self.ir.append(inst_name, param1, param2)
 
     def print_code(self, out_method):
         """
@@ -109,41 +114,49 @@ class Pl0Parent(Pl0Const):
         """
         self.generate_instruction(self.inst(Inst.lod), symbol.level, symbol.address)
 
-    def correct_jmc_for_logical_condition(self, x):
-        for i in self.code:
-            if i[2] == "or_mark":
-                i[2] = len(self.code) + 1
-            if i[2] == "and_mark":
-                i[2] = x
+    def new_label(self):
+        """
+        It returns a new placeholder for an address of jump
+        """
+        self.label_count += 1
+        return "L" + str(self.label_count)
 
-    def gen_opr(self, const1, operator: Op, const2, symbol_table=None, real_level=0):
+    def generate_jump(self, inst_name, label):
         """
-        It generates instructions for the operation of two constants
-        :param const1: The first constant to be used in the operation
-        :param operator: o = enum('+', '-', '*', '/', '<', '>', '=', '<=', '>=', '<>', 'and', 'or', 'not', 'neg')
-        :type operator: o
-        :param const2: The second constant to be used in the operation
+        It generates a jump to the label, the address is filled in when the code is lowered
+
+        :param inst_name: JMP or JMC instruction
+        :param label: label created by new_label
         """
-        if const1:
-            self.gen_const(const1, symbol_table, real_level=real_level)
-        if const2:
-            self.gen_const(const2, symbol_table, real_level=real_level)
-        self.generate_instruction(self.inst(Inst.opr), 0, str(operator))
+        self.generate_instruction(inst_name, 0, label)
 
-    def gen_opr_add(self, const1=None, const2=None, symbol_table=None, real_level=0):
-        self.gen_opr(const1, self.op(Op.add), const2, symbol_table=symbol_table, real_level=real_level)
+    def place_label(self, label):
+        """
+        It places the label to the next instruction
 
-    def gen_opr_sub(self, const1=None, const2=None, symbol_table=None, real_level=0):
-        self.gen_opr(const1, self.op(Op.sub), const2, symbol_table=symbol_table, real_level=real_level)
+        :param label: label created by new_label
+        """
+        self.ir.place_label(label)
 
-    def gen_opr_mul(self, const1=None, const2=None, symbol_table=None, real_level=0):
-        self.gen_opr(const1, self.op(Op.mul), const2, symbol_table=symbol_table, real_level=real_level)
+    def get_function_label(self, name):
+        """
+        It returns the label of the first instruction of the function, the function can be declared later
 
-    def gen_opr_div(self, const1=None, const2=None, symbol_table=None, real_level=0):
-        self.gen_opr(const1, self.op(Op.div), const2, symbol_table=symbol_table, real_level=real_level)
+        :param name: name of the function
+        """
+        if name not in self.function_labels:
+            self.function_labels[name] = self.new_label()
+        return self.function_labels[name]
 
-    def gen_term(self, const1=None, const2=None, symbol_table=None, real_level=0):
-        self.gen_const(const1, symbol_table=symbol_table, real_level=real_level)
+    def lower_ir(self):
+        """
+        It emits the code from the intermediate representation and stores addresses of functions to the symbol table
+        """
+        self.code = self.ir.lower()
+        addresses = self.ir.get_label_addresses()
+        for name, label in self.function_labels.items():
+            if label in addresses:
+                self.symbol_table[name].address = addresses[label]
 
     def gen_sub(self, operator):
         self.generate_instruction(self.inst(Inst.opr), 0, self.op(Op.sub))
@@ -157,6 +170,9 @@ class Pl0Parent(Pl0Const):
     def gen_divby(self, operator):
         self.generate_instruction(self.inst(Inst.opr), 0, self.op(Op.div))
 
+    def gen_neg(self):
+        self.generate_instruction(self.inst(Inst.opr), 0, self.op(Op.neg))
+
     def gen_lesser(self):
         self.generate_instruction(self.inst(Inst.opr), 0, self.op(Op.lt))
 
@@ -196,15 +212,3 @@ class Pl0Parent(Pl0Const):
         :return: The value of the operation.
         """
         return operation.value
-
-    @staticmethod
-    def clear_tree(tree_iter_generator):
-        """
-        It takes a generator that yields tree iterators, and clears the tree of all rows
-        :param tree_iter_generator: A generator that returns a Gtk.TreeIter for each row in the tree
-        """
-        sub_tree = []
-        for i in tree_iter_generator:
-            if not i[0]:
-                sub_tree.append(i[1])
-        return sub_tree
@@ -1,10 +1,24 @@
 #  date: 31. 12. 2022
 #  author: Daniel Schnurpfeil
 #
-from copy import copy
-
 from src.pl0_code_generator.instructions import Inst, Op
 
+# binary operations of the OPR instruction, comparisons give 1 or 0
+binary_operations = {
+    Op.add.value: lambda a, b: a + b,
+    Op.sub.value: lambda a, b: a - b,
+    Op.mul.value: lambda a, b: a * b,
+    Op.eq.value: lambda a, b: int(a == b),
+    Op.ne.value: lambda a, b: int(a != b),
+    Op.lt.value: lambda a, b: int(a < b),
+    Op.ge.value: lambda a, b: int(a >= b),
+    Op.gt.value: lambda a, b: int(a > b),
+    Op.le.value: lambda a, b: int(a <= b),
+}
+
+# errors of a program the machine can not execute
+execution_errors = (IndexError, KeyError, TypeError, ValueError, ZeroDivisionError, RuntimeError)
+
 
 def ret_stack_as_str(stack: list) -> str:
     """
@@ -19,147 +33,170 @@ def ret_stack_as_str(stack: list) -> str:
     return ret_val
 
 
-def run_pl0_code(generated_code: list) -> str:
+def divide(a, b) -> int:
     """
-    It takes a list of pl/0 code, and returns a string of stack
+    It divides integers and rounds the result towards zero like the PL/0 machine
 
-    :param generated_code: list
-    :type generated_code: list
+    :param a: dividend
+    :param b: divisor
     """
-    if len(generated_code) > 130:
-        return "code is too long"
-    static_base = 0
-    stack_pointer = -1
-    instruction_pointer = 0
-    stack = []
-
-    # Checking if the instruction pointer is less than the length of the generated code.
-    while instruction_pointer < len(generated_code):
-        # Checking if the instruction is a lit.
-        if generated_code[instruction_pointer][0] == Inst.lit.value:
-            stack_pointer += 1
-            if stack_pointer >= len(stack):
-                stack.append(generated_code[instruction_pointer][2])
-            else:
-                stack[stack_pointer] = generated_code[instruction_pointer][2]
+    quotient = abs(a) // abs(b)
+    return quotient if (a < 0) == (b < 0) else -quotient
 
-        # Checking if the instruction is an operator.
-        elif generated_code[instruction_pointer][0] == Inst.opr.value:
 
-            if int(generated_code[instruction_pointer][2]) == Op.neg.value:
-                stack[stack_pointer] = -stack[stack_pointer]
+def get_base(stack, base, level) -> int:
+    """
+    It follows static links of the stack frames to the base of the frame level levels up
 
-            elif int(generated_code[instruction_pointer][2]) == Op.add.value:
-                stack[stack_pointer - 1] = stack[stack_pointer - 1] + stack[stack_pointer]
-                stack_pointer -= 1
-            elif int(generated_code[instruction_pointer][2]) == Op.sub.value:
-                stack[stack_pointer - 1] = stack[stack_pointer - 1] - stack[stack_pointer]
-                stack_pointer -= 1
+    :param stack: stack of the machine
+    :param base: base of the current frame
+    :param level: difference of the levels
+    """
+    for _ in range(level):
+        base = stack[base]
+    return base
 
-            elif int(generated_code[instruction_pointer][2]) == Op.mul.value:
-                stack[stack_pointer - 1] = stack[stack_pointer - 1] * stack[stack_pointer]
-                stack_pointer -= 1
 
-            elif int(generated_code[instruction_pointer][2]) == Op.div.value:
-                stack[stack_pointer - 1] = stack[stack_pointer - 1] / stack[stack_pointer]
-                stack_pointer -= 1
+def set_value(stack, address, value):
+    """
+    It writes the value to the stack, the stack grows when the address is above its end
 
-            elif int(generated_code[instruction_pointer][2]) == Op.mod.value:
-                stack[stack_pointer - 1] = stack[stack_pointer - 1] % stack[stack_pointer]
-                stack_pointer -= 1
+    :param stack: stack of the machine
+    :param address: address in the stack
+    :param value: written value
+    """
+    if address >= len(stack):
+        stack += [0] * (address + 1 - len(stack))
+    stack[address] = value
 
-            elif int(generated_code[instruction_pointer][2]) == Op.eq.value:
-                if stack[stack_pointer - 1] == stack[stack_pointer]:
-                    stack[stack_pointer - 1] = 1
-                else:
-                    stack[stack_pointer - 1] = 0
-                stack_pointer -= 1
 
-            elif int(generated_code[instruction_pointer][2]) == Op.ne.value:
-                if stack[stack_pointer - 1] != stack[stack_pointer]:
-                    stack[stack_pointer - 1] = 1
-                else:
-                    stack[stack_pointer - 1] = 0
-                stack_pointer -= 1
+def execute(generated_code: list, stack: list, base=0, instruction_pointer=0, max_steps=None) -> list:
+    """
+    It executes the instructions until the frame at the base returns, the stack is changed in place.
+    The program is run from its frame at the base 0, a single function is run from a frame above its caller.
+
+    :param generated_code: list of instructions, every instruction is [name, level, parameter]
+    :param stack: stack of the machine, values below the base belong to callers of the frame
+    :param base: base of the executed frame
+    :param instruction_pointer: address of the first executed instruction
+    :param max_steps: number of instructions that can be executed, unlimited if None
+    :return: the stack
+    """
+    entry_base = base
+    stack_pointer = base - 1
+    steps = 0
+    while True:
+        # Checking if the instruction pointer and the stack pointer are in the program and in the frame.
+        if not 0 <= instruction_pointer < len(generated_code) or stack_pointer < entry_base - 1:
+            raise IndexError("ERR in executing generated code...")
+        if max_steps is not None and steps == max_steps:
+            raise RuntimeError(f"ERR the program did not end in {max_steps} steps...")
+        steps += 1
+        name, level, parameter = generated_code[instruction_pointer]
+        instruction_pointer += 1
 
-            elif int(generated_code[instruction_pointer][2]) == Op.lt.value:
-                if stack[stack_pointer - 1] < stack[stack_pointer]:
-                    stack[stack_pointer - 1] = 1
-                else:
-                    stack[stack_pointer - 1] = 0
-                stack_pointer -= 1
+        # Pushing the literal.
+        if name == Inst.lit.value:
+            stack_pointer += 1
+            set_value(stack, stack_pointer, parameter)
 
-            elif int(generated_code[instruction_pointer][2]) == Op.ge.value:
-                if stack[stack_pointer - 1] >= stack[stack_pointer]:
-                    stack[stack_pointer - 1] = 1
-                else:
-                    stack[stack_pointer - 1] = 0
+        # Operators replace their operands on the top of the stack by the result.
+        elif name == Inst.opr.value:
+            operation = int(parameter)
+            if operation == Op.neg.value:
+                stack[stack_pointer] = -stack[stack_pointer]
+            elif operation == Op.odd.value:
+                stack[stack_pointer] = stack[stack_pointer] % 2
+            else:
                 stack_pointer -= 1
-
-            elif int(generated_code[instruction_pointer][2]) == Op.le.value:
-                if stack[stack_pointer - 1] <= stack[stack_pointer]:
-                    stack[stack_pointer - 1] = 1
+                a, b = stack[stack_pointer], stack[stack_pointer + 1]
+                if operation == Op.div.value:
+                    stack[stack_pointer] = divide(a, b)
+                elif operation == Op.mod.value:
+                    stack[stack_pointer] = a - b * divide(a, b)
                 else:
-                    stack[stack_pointer - 1] = 0
+                    stack[stack_pointer] = binary_operations[operation](a, b)
+
+        # Loading and storing the variable of the frame level levels up.
+        elif name == Inst.lod.value or name == Inst.sto.value:
+            variable_address = get_base(stack, base, int(level)) + parameter
+            if variable_address < 0:
+                raise IndexError("ERR in executing generated code...")
+            if name == Inst.lod.value:
+                stack_pointer += 1
+                set_value(stack, stack_pointer, stack[variable_address])
+            else:
+                set_value(stack, variable_address, stack[stack_pointer])
                 stack_pointer -= 1
 
-            elif int(generated_code[instruction_pointer][2]) == Op.gt.value:
-                if stack[stack_pointer - 1] > stack[stack_pointer]:
-                    stack[stack_pointer - 1] = 1
-                else:
-                    stack[stack_pointer - 1] = 0
-                stack_pointer -= 1
+        # It adds the value of the instruction to the stack pointer.
+        elif name == Inst.int.value:
+            stack_pointer += parameter
+            if stack_pointer >= len(stack):
+                set_value(stack, stack_pointer, 0)
+
+        # Calling a function, its frame starts with the static link, the dynamic link and the return address.
+        elif name == Inst.cal.value:
+            set_value(stack, stack_pointer + 3, instruction_pointer)
+            stack[stack_pointer + 1:stack_pointer + 3] = [get_base(stack, base, int(level)), base]
+            base = stack_pointer + 1
+            instruction_pointer = parameter
+
+        # Returning from the frame, the execution ends when the entry frame returns.
+        elif name == Inst.ret.value:
+            if base == entry_base:
+                return stack
+            stack_pointer = base - 1
+            instruction_pointer = stack[base + 2]
+            base = stack[base + 1]
 
-        # It loads the value of the stack to the stack pointer.
-        elif generated_code[instruction_pointer][0] == Inst.lod.value:
-            stack_pointer += 1
-            if stack_pointer - len(stack) > -1:
-                stack.append(0)
-            stack[stack_pointer] = stack[generated_code[instruction_pointer][2] + static_base]
+        # Jumping to the instruction that is given in the generated code.
+        elif name == Inst.jmp.value:
+            instruction_pointer = parameter
 
-        # It stores the value of the stack pointer to the stack.
-        elif generated_code[instruction_pointer][0] == Inst.sto.value:
-            stack[generated_code[instruction_pointer][2] + static_base] = stack[stack_pointer]
+        # Jumping if the top of the stack is 0, the condition is removed from the stack in both cases.
+        elif name == Inst.jmc.value:
             stack_pointer -= 1
+            if stack[stack_pointer + 1] == 0:
+                instruction_pointer = parameter
 
-        # Calling a function.
-        elif generated_code[instruction_pointer][0] == Inst.cal.value:
-            stack.append(stack_pointer)
-            stack.append(0)
-            stack.append(copy(instruction_pointer))
-            instruction_pointer = generated_code[instruction_pointer][2] - 1
-            static_base = stack_pointer + 1
+        else:
+            raise ValueError(f"ERR unknown instruction {name}...")
 
-        # It adds the value of the instruction to the stack pointer.
-        # If the stack pointer is greater than the length of the stack, it adds 0 to the stack.
-        elif generated_code[instruction_pointer][0] == Inst.int.value:
-            stack_pointer += generated_code[instruction_pointer][2]
-            if stack_pointer - len(stack) > -1:
-                for _ in range(stack_pointer - len(stack) + 1):
-                    stack.append(0)
-
-        # Returning the value of the stack.
-        elif generated_code[instruction_pointer][0] == Inst.ret.value:
-            if static_base == 0:
-                break
-            instruction_pointer = stack[static_base + 2]
-            stack_pointer = static_base - 1
-            static_base = 0
-
-        # Checking if the stack pointer is 0. If it is, it jumps to the instruction that is given in the generated code.
-        elif generated_code[instruction_pointer][0] == Inst.jmc.value:
-            if stack[stack_pointer] == 0:
-                instruction_pointer = generated_code[instruction_pointer][2] - 1
 
-        # Jumping to the instruction that is given in the generated code.
-        elif generated_code[instruction_pointer][0] == Inst.jmp.value:
-            instruction_pointer = generated_code[instruction_pointer][2] - 1
+def run_pl0_code(generated_code: list, max_steps=None) -> str:
+    """
+    It takes a list of pl/0 code, and returns a string of stack
 
-        # Checking if the instruction pointer is less than the length of the generated code and stack controls too.
-        if instruction_pointer < 0 or instruction_pointer > len(generated_code) or \
-                stack_pointer < 0 or stack_pointer > len(stack):
-            raise IndexError("ERR in executing generated code...")
+    :param generated_code: list
+    :type generated_code: list
+    :param max_steps: number of instructions that can be executed, unlimited if None
+    """
+    if len(generated_code) > 130:
+        return "code is too long"
+    return ret_stack_as_str(execute(generated_code, [], max_steps=max_steps))
 
-        # Incrementing the instruction pointer by 1.
-        instruction_pointer += 1
-    return ret_stack_as_str(stack)
+
+def evaluate_function(generated_code: list, address, arguments, max_steps):
+    """
+    It calls the function in a separate stack and returns the value it returned.
+    The caller is simulated the same way the code generator calls functions: the return value slot
+    and the arguments are pushed before the call.
+
+    :param generated_code: generated instructions of the program
+    :param address: address of the first instruction of the function
+    :param arguments: integer arguments of the call
+    :param max_steps: number of instructions the function can execute
+    :return: returned integer or None if the function did not return in time or failed
+    """
+    # frame of the caller, slot for the returned value and the arguments
+    stack = [0, 0, 0, 0] + list(arguments)
+    result_address = 3
+    # frame of the function: static link, dynamic link and return address
+    base = len(stack)
+    stack += [0, 0, 0]
+    try:
+        execute(generated_code, stack, base, address, max_steps)
+    except execution_errors:
+        return None
+    return stack[result_address]
@@ -1,19 +1,14 @@
 # class responsible from semantic analysis
 
-from src.syntax_analyzer.symbol_table import find_entry_in_symbol_table
+from src.syntax_analyzer.name_resolution import get_symbol
 
 
 class Analyzer:
     def __init__(self, dst, symbol_table):
         self.__dst = dst
         self.__symbol_table = symbol_table
-        self.__visited_nodes = set()
         self.__var_types = {"let", "var"}
         self.__data_types = {"Int", "Boolean", "Array", "String"}
-        # actual inception
-        self.real_level = 0
-        # global scope (0) or name of func
-        self.level = 0
         # ret_statement_count in curr function max is 1
         self.ret_statement_count = 0
         # ret val type
@@ -26,105 +21,61 @@ class Analyzer:
     # preorder tree traversal
     # build symbol table
     # check for semantics
-    def Analyze(self) -> bool:
-        root = self.__dst
-        # traverse the tree, parent -> left subtree -> right subtree
-        for node in root.traverse("preorder"):
-            # subtree already visited
-            if node in self.__visited_nodes:
+    # every function is an independent task, the tasks are mapped through the executor if it is given,
+    # it must run them in this process (ie. ThreadPoolExecutor), because types are stored to the tree
+    # errors are reported in the order of the source, independently of the order the tasks finished in
+    def Analyze(self, executor=None) -> bool:
+        # parent -> left subtree -> right subtree, children are pushed in reverse order
+        checked = []
+        stack = [self.__dst]
+        while stack:
+            node = stack.pop()
+            # the handler of a node checks its whole subtree, the traversal only descends through nodes without one
+            if node.name not in self.__handlers:
+                stack.extend(reversed(node.children))
                 continue
-            is_okay = self.__eval_node(node)
-            if not is_okay:
-                raise Exception("Program contains an error. Compilation to PL0 is not possible.")
-        return True
+            checked.append(node)
+        functions = [i for i in checked if i.name == "function_declaration"]
+        map_tasks = map if executor is None else executor.map
+        function_errors = iter(map_tasks(self.check_function, functions))
+        errors = []
+        for node in checked:
+            # the code outside of functions is checked here, in the order of the source
+            error = next(function_errors) if node.name == "function_declaration" else self.check_node(node)
+            if error is not None:
+                errors.append(error)
+        if errors:
+            raise Exception("\n".join(errors))
+        return True
+
+    # checks the subtree of the node, returns the error or None if the subtree is correct
+    def check_node(self, node):
+        try:
+            if not self.__eval_node(node):
+                return "Program contains an error. Compilation to PL0 is not possible."
+        except Exception as e:
+            return str(e)
+        return None
+
+    # checks the function declaration by a new analyzer sharing the table of symbols,
+    # so the function is checked independently of the code around it, returns the error or None
+    def check_function(self, node):
+        return Analyzer(node, self.__symbol_table).check_node(node.get_children()[0])
 
     # method evaluates semantic "correctness" of tree node
     # if the node is not correct, False value is returned
+    # handlers of values store the checked type of the value to the attribute dtype of the node
     def __eval_node(self, node) -> bool:
-        node_name = node.name
-        subtree_okay = True
-        if node_name == "variable_declaration":
-            subtree_okay = self.__eval_var_declaration(node)
-        elif node_name == "var_declaration_expression":
-            subtree_okay = self.__eval_var_declaration_expression(node)
-        elif node_name == "data_type":
-            subtree_okay = self.__eval_data_type(node)
-        elif node_name == "expression_term":
-            subtree_okay = self.__eval_expression_term(node)
-        elif node_name == "expression_multiply":
-            subtree_okay = self.__eval_expression_multiply(node)
-        elif node_name == "expression_sum":
-            subtree_okay = self.__eval_expression_sum(node)
-        elif node_name == "expression_minus":
-            subtree_okay = self.__eval_expression_minus(node)
-        elif node_name == "expression_divide":
-            subtree_okay = self.__eval_expression_divide(node)
-        elif node_name == "expression_in_parent":
-            subtree_okay = self.__eval_expression_in_parenthesis(node)
-        elif node_name == "factor_expression":
-            subtree_okay = self.__eval_factor_expression(node)
-        elif node_name == "factor":
-            subtree_okay = self.__eval_factor(node)
-        elif node_name == "function_call":
-            subtree_okay = self.__eval_function_call(node)
-        elif node_name == "var_value" or node_name == "var_value_boolean" or node_name == "var_value_string" or node_name == "var_value_identifier":
-            subtree_okay = self.__eval_var_value(node)
-        elif node_name == "function_declaration":
-            subtree_okay = self.__eval_function_declaration(node)
-        elif node_name == "params":
-            subtree_okay = self.__eval_function_parameters(node)
-        elif node_name == "function_signature":
-            subtree_okay = self.__eval_function_signature(node)
-        elif node_name == "compound_block":
-            subtree_okay = self.__eval_comp_block(node)
-        # [JT] names of all nodes whose children represent a block, either a function body, if/if-else body or loop body
-        elif node_name == "block" or node_name == "block_var_dekl" or node_name == "block_expression" or node_name == "block_statement":
-            subtree_okay = self.__eval_block(node)
-        elif node_name == "for_loop_block":
-            subtree_okay = self.__eval_for_loop_block(node)
-        elif node_name == "loop_step":
-            subtree_okay = self.__eval_loop_step(node)
-        elif node_name == "loop_var":
-            subtree_okay = self.__eval_loop_var(node)
-        elif node_name == "condition":
-            subtree_okay = self.__eval_condition(node)
-        elif node_name == "compound_condition":
-            subtree_okay = self.__eval_compound_condition(node)
-        elif node_name == "simple_condition":
-            subtree_okay = self.__eval_simple_condition(node)
-        elif node_name == "id_compound_condition":
-            subtree_okay = self.__eval_id_compound_condition(node)
-        elif node_name == "compound_negation_condition":
-            subtree_okay = self.__eval_compound_negation_condition(node)
-        elif node_name == "var_modification":
-            subtree_okay = self.__eval_var_modification(node)
-        elif node_name == "array_var_modification":
-            subtree_okay = self.__eval_array_var_modification(node)
-        elif node_name == "if_stmt":
-            subtree_okay = self.__eval_if_stmt(node)
-        elif node_name == "if_else_stmt":
-            subtree_okay = self.__eval_if_else_stmt(node)
-        elif node_name == "return_statement":
-            subtree_okay = self.__eval_return_statement(node)
-        elif node_name == "ternary_operator":
-            subtree_okay = self.__eval_ternary_operator(node)
-        elif node_name == "while_loop_block":
-            subtree_okay = self.__eval_while_statement(node)
-        elif node_name == "repeat_loop_block":
-            subtree_okay = self.__eval_repeat_statement(node)
-        elif node_name == "unary_minus":
-            subtree_okay = self.__eval_unary_minus(node)
-        elif node_name == "negation_condition":
-            subtree_okay = self.__eval_negation_condition(node)
-        elif node_name == "const_expression_term":
-            subtree_okay = True
-        elif node_name == "array_var_modification":
-            subtree_okay = self.__eval_array_var_modification(node)
-        elif node_name == "array_value":
-            subtree_okay = self.__eval_array_value(node)
-
-        self.__mark_visited(node)
-        return subtree_okay
+        # the handler is looked up by the kind of the node, kinds without a handler are always correct
+        handler = self.__handlers.get(node.name)
+        return handler(self, node) if handler is not None else True
+
+    # constant folded by the parser is always an integer
+    def __eval_const_expression_term(self, node):
+        self.__subtree_leaf_value = node.get_children()[0].name
+        self.__subtree_leaf_dtype = "Int"
+        node.dtype = "Int"
+        return True
 
     def __eval_array_value(self, node):
         children = node.get_children()
@@ -140,6 +91,7 @@ class Analyzer:
             int_count += 1
         self.__subtree_leaf_value = int_count
         self.__subtree_leaf_dtype = "Array"
+        node.dtype = "Array"
         return True
 
     def __eval_compound_negation_condition(self, node):
@@ -168,7 +120,7 @@ class Analyzer:
         # if array assignment cannot be done for every operation (for some reason), we can catch it here
         operation = children[2].name
         expression = children[3]
-        if not self.__find_identifier(identifier, lineno):
+        if not self.__find_identifier(node, lineno):
             raise Exception(f"Error on line {lineno}. Variable {identifier} on line {lineno} is not defined.")
 
         if self.__identifier_table_entry.size <= index:
@@ -255,6 +207,7 @@ class Analyzer:
         if left_side_info[1] != right_side_info[1]:
             raise Exception(f"Error on line {lineno}. Type mismatch."
                             f" Both expressions of ternary operator must be of the same type.")
+        node.dtype = expression_true.dtype
         return True
 
     def __eval_negation_condition(self, node):
@@ -277,6 +230,7 @@ class Analyzer:
         if not is_expression_okay:
             raise Exception(
                 f"Error on line {lineno}. Expression: {self.__get_string_aprox_of_subtree(expression)} contains an error.")
+        node.dtype = expression.dtype
         return True
 
     def __eval_unary_minus(self, node):
@@ -290,6 +244,7 @@ class Analyzer:
         if self.__subtree_leaf_dtype != "Int":
             raise Exception(f"Error on line {lineno} in unary minus operation. "
                             f"Unary minus can only be performed on integers.")
+        node.dtype = expression.dtype
         return True
 
     def __eval_compound_condition(self, node):
@@ -384,6 +339,7 @@ class Analyzer:
         if left_side_info[1] != right_side_info[1]:
             raise Exception(
                 f"Error on line {lineno}. Type mismatch in addition. Addition can only be performed with integers.")
+        node.dtype = term.dtype
         return True
 
     def __eval_expression_divide(self, node):
@@ -407,6 +363,7 @@ class Analyzer:
                             f"Divisor is not a valid expression.")
         if type(self.__subtree_leaf_value) is int and self.__subtree_leaf_value == 0:
             raise Exception(f"Error on line {lineno}. Division by zero is not defined.")
+        node.dtype = factor.dtype
         return True
 
     def __eval_expression_minus(self, node):
@@ -428,6 +385,7 @@ class Analyzer:
         if left_side_info[1] != right_side_info[1]:
             raise Exception(
                 f"Error on line {lineno}. Type mismatch in subtraction. Subtraction can only be performed with integers.")
+        node.dtype = term.dtype
         return True
 
     def __eval_if_else_stmt(self, node):
@@ -469,7 +427,7 @@ class Analyzer:
         identifier = children[0].name
         modification_operator = children[1].name
         expression = children[2]
-        is_valid_identifier = self.__find_identifier(identifier, lineno)
+        is_valid_identifier = self.__find_identifier(node, lineno)
         if not is_valid_identifier:
             raise Exception(f"Error on line {lineno}. Identifier {identifier} is not defined.")
         if self.__identifier_table_entry.const:
@@ -486,12 +444,11 @@ class Analyzer:
                 f" Function call can be only used with assignment operator, '='.")
         return True
 
+    # function declared in a block of another function is checked in the task of that function
     def __eval_function_declaration(self, node):
-        lineno = node.lineno
-        children = node.get_children()
-        is_function_okay = self.__eval_node(children[0])
-        if not is_function_okay:
-            raise Exception(f"Error on line {lineno}. Function declaration contains an error")
+        error = self.check_function(node)
+        if error is not None:
+            raise Exception(error)
         return True
 
     def __eval_for_loop_block(self, node):
@@ -546,7 +503,7 @@ class Analyzer:
         lineno = node.lineno
         children = node.get_children()
         identifier = children[0].name
-        is_valid_identifier = self.__find_identifier(identifier, lineno)
+        is_valid_identifier = self.__find_identifier(node, lineno)
         if not is_valid_identifier:
             raise Exception(f"Error on line {lineno} in for loop step. {identifier} is not declared.")
         if self.__identifier_table_entry.const:
@@ -573,12 +530,6 @@ class Analyzer:
         params = children[1]
         return_type = children[2]
         body = children[3]
-        # save previous scope
-        previous_level = self.level
-        previous_return_count = self.ret_statement_count
-        previous_return_val = self.ret_value
-        # update scope
-        self.level = function_name
         params_ok = self.__eval_node(params)
 
         if not params_ok:
@@ -590,8 +541,6 @@ class Analyzer:
                 raise Exception(f"Error on line {lineno}. Return type of function {function_name} "
                                 f"contains and error. Valid types: Int, Boolean")
             return_type_val = return_type.get_children()[0].name
-        else:
-            self.__mark_visited(return_type)
         body_ok = self.__eval_node(body)
         if not body_ok:
             raise Exception(f"Error on line {lineno}. Body of function {function_name} contains an error.")
@@ -606,16 +555,22 @@ class Analyzer:
                 raise Exception(f" Error on line {lineno}. "
                                 f"Last statement in function block of function {function_name} "
                                 f"which is of type {return_type_val} must be a return statement.")
-
-        # restore previous scope
-        self.level = previous_level
-        self.ret_statement_count = previous_return_count
-        self.ret_value = previous_return_val
         return True
 
     # parameters are very strictly defined in grammar, they can't really be wrong.
+    # only data types of the parameters are checked
     def __eval_function_parameters(self, node):
-        # children = node.get_children()
+        lineno = node.lineno
+        declaration = node.get_children()[0]
+        # parameters_declaration_list has the rest of the parameters as the last child
+        while declaration.name in ("parameters_declaration_list", "parameter_declaration"):
+            children = declaration.get_children()
+            is_data_type_okay = self.__eval_node(children[1])
+            if not is_data_type_okay:
+                raise Exception(f"Error on line {lineno}. Data type of parameter {children[0].name} contains an error.")
+            if len(children) == 2:
+                break
+            declaration = children[2]
         return True
 
     def __eval_block(self, node):
@@ -624,33 +579,28 @@ class Analyzer:
         # traverse through block subtree - taking over "control" from the main traversal loop
         while True:
             children = tmp_node.get_children()
-            n = len(children)
-            tmp = children[0]
-            # block variable declaration, the relevant subtree is on index 1 instead of 0
-            if n == 3:
-                tmp = children[1]
+            # block variable declaration, the relevant subtree is on index 1 after the keyword instead of 0
+            statement_index = 0 if children[0].children else 1
+            tmp = children[statement_index]
             is_statement_okay = self.__eval_node(tmp)
             if not is_statement_okay:
                 raise Exception(f"Error on line {lineno} in block.")
 
-            if len(children) == 1:
+            # the rest of the block follows the statement
+            if len(children) == statement_index + 1:
                 if tmp.name != "block":
                     self.__last_stmt_in_block = tmp.name
                 break
-            tmp_node = children[1]
-            if n == 3:
-                tmp_node = children[2]
+            tmp_node = children[statement_index + 1]
 
         return True
 
     def __eval_comp_block(self, node):
         lineno = node.lineno
-        self.real_level += 1
         block_node = node.get_children()[0]
         is_block_okay = self.__eval_node(block_node)
         if not is_block_okay:
             raise Exception(f"Error on line {lineno} in compound block.")
-        self.real_level -= 1
         return True
 
     # check if variable declaration is semantically correct
@@ -659,7 +609,6 @@ class Analyzer:
         lineno = node.lineno
         children = node.get_children()
         var_type = children[0]
-        self.__mark_visited(var_type)
         # check variable type
         if var_type.name not in self.__var_types:
             raise Exception(f"Error on line {lineno}."
@@ -709,6 +658,7 @@ class Analyzer:
         expression_valid = self.__eval_node(expression)
         if not expression_valid:
             raise Exception(f"Error on line {lineno}. Invalid value of expression {expression}.")
+        node.dtype = expression.dtype
         return True
 
     # only int type can be multiplied
@@ -731,6 +681,7 @@ class Analyzer:
             raise Exception(
                 f"Error on line {lineno}. Type mismatch, cannot multiply types: {subtree_value[1]}, {sub_sub_tree_value[1]}."
                 f" Multiplication is only allowed with Int data type. ")
+        node.dtype = children[0].dtype
         return True
 
     def __eval_factor_expression(self, node):
@@ -740,6 +691,7 @@ class Analyzer:
         if not value_valid:
             raise Exception(
                 f"Error on line {lineno}. Invalid expression {self.__get_string_aprox_of_subtree(children[0])}")
+        node.dtype = children[0].dtype
         return value_valid
 
     def __eval_factor(self, node):
@@ -748,29 +700,33 @@ class Analyzer:
         factor_value_valid = self.__eval_node(children[0])
         if not factor_value_valid:
             raise Exception(f"Error on line {lineno}. Invalid value {self.__get_string_aprox_of_subtree(children[0])}")
+        node.dtype = children[0].dtype
         return True
 
     def __eval_var_value(self, node):
         lineno = node.lineno
         node_name = node.name
         value = node.get_children()[0].name
-        self.__mark_visited(node.get_children()[0])
         self.__subtree_leaf_value = value
         if node_name == "var_value":
             self.__subtree_leaf_dtype = "Int"
+            node.dtype = "Int"
             return True
         elif node_name == "var_value_boolean":
             self.__subtree_leaf_dtype = "Boolean"
+            node.dtype = "Boolean"
             return True
         elif node_name == "var_value_string":
             self.__subtree_leaf_dtype = "String"
+            node.dtype = "String"
             return True
         elif node_name == "var_value_identifier":
             self.__subtree_leaf_dtype = "identifier"
-        valid_identifier = self.__find_identifier(value, lineno)
+        valid_identifier = self.__find_identifier(node, lineno)
         if not valid_identifier:
             raise Exception(f"Error on line {lineno}. Invalid identifier {value}.")
         self.__subtree_leaf_value = self.__identifier_table_entry
+        node.dtype = self.__identifier_table_entry.type
 
         return True
 
@@ -778,7 +734,7 @@ class Analyzer:
         lineno = node.lineno
         children = node.get_children()
         function_name = children[0].name
-        is_valid_identifier = self.__find_identifier(function_name, lineno)
+        is_valid_identifier = self.__find_identifier(node, lineno)
         if not is_valid_identifier:
             raise Exception(f"Error on line {lineno}. Function {function_name} is not declared.")
         function_prototype = self.__identifier_table_entry
@@ -789,12 +745,12 @@ class Analyzer:
         if not function_call_ok:
             raise Exception(f"Error on line {lineno}. Function call {function_name} contains an error. ")
         self.__subtree_leaf_value, self.__subtree_leaf_dtype = function_prototype.name, function_prototype.return_type
+        node.dtype = function_prototype.return_type
         return function_call_ok
 
     def __eval_data_type(self, node):
         lineno = node.lineno
         data_type = node.get_children()[0]
-        self.__mark_visited(node.get_children()[0])
         if data_type.name == "array_type":
             data_type = data_type.get_children()[0]
         if data_type.name not in self.__data_types:
@@ -803,10 +759,6 @@ class Analyzer:
         self.__subtree_leaf_dtype = data_type.name
         return True
 
-    # mark node as visited
-    def __mark_visited(self, node):
-        self.__visited_nodes.add(node)
-
     def __check_function_call(self, function_params, function_arguments, lineno):
         tmp = list(function_params.keys())
         walker = 0
@@ -826,7 +778,6 @@ class Analyzer:
                 argument_ok = self.__compare_argument_and_parameter(kiddos[0], function_params[tmp[walker]], lineno)
                 if not argument_ok:
                     return False
-                self.__mark_visited(kiddos[1])
                 kiddos = kiddos[1].get_children()
                 walker += 1
         # single argument of function
@@ -865,10 +816,11 @@ class Analyzer:
                             f"got array with length {self.__subtree_leaf_value}")
         return True
 
-    def __find_identifier(self, identifier, lineno):
-        symbol = find_entry_in_symbol_table(self.__symbol_table, self.level, self.real_level, identifier)
+    # identifiers are bound to their symbol records by the name resolution before the analysis
+    def __find_identifier(self, node, lineno):
+        symbol = get_symbol(node)
         if symbol is None or (symbol.type != "func" and symbol.lineno > lineno):
-            raise Exception(f"Error on line {lineno}. Identifier {identifier} not declared!")
+            raise Exception(f"Error on line {lineno}. Identifier {node.children[0].name} not declared!")
         self.__identifier_table_entry = symbol
         self.__subtree_leaf_dtype = symbol.type
         return True
@@ -893,3 +845,53 @@ class Analyzer:
         for i in range(len(leaves)):
             str += leaves[i].name
         return str
+
+    # handler of every kind of node evaluated by __eval_node, built once with the class
+    # kinds without a handler are always correct
+    __handlers = {
+        "variable_declaration": __eval_var_declaration,
+        "var_declaration_expression": __eval_var_declaration_expression,
+        "data_type": __eval_data_type,
+        "expression_term": __eval_expression_term,
+        "expression_multiply": __eval_expression_multiply,
+        "expression_sum": __eval_expression_sum,
+        "expression_minus": __eval_expression_minus,
+        "expression_divide": __eval_expression_divide,
+        "expression_in_parent": __eval_expression_in_parenthesis,
+        "factor_expression": __eval_factor_expression,
+        "factor": __eval_factor,
+        "function_call": __eval_function_call,
+        "var_value": __eval_var_value,
+        "var_value_boolean": __eval_var_value,
+        "var_value_string": __eval_var_value,
+        "var_value_identifier": __eval_var_value,
+        "function_declaration": __eval_function_declaration,
+        "params": __eval_function_parameters,
+        "function_signature": __eval_function_signature,
+        "compound_block": __eval_comp_block,
+        # [JT] names of all nodes whose children represent a block, either a function body, if/if-else body or loop body
+        "block": __eval_block,
+        "block_var_dekl": __eval_block,
+        "block_expression": __eval_block,
+        "block_statement": __eval_block,
+        "for_loop_block": __eval_for_loop_block,
+        "loop_step": __eval_loop_step,
+        "loop_var": __eval_loop_var,
+        "condition": __eval_condition,
+        "compound_condition": __eval_compound_condition,
+        "simple_condition": __eval_simple_condition,
+        "id_compound_condition": __eval_id_compound_condition,
+        "compound_negation_condition": __eval_compound_negation_condition,
+        "var_modification": __eval_var_modification,
+        "array_var_modification": __eval_array_var_modification,
+        "if_stmt": __eval_if_stmt,
+        "if_else_stmt": __eval_if_else_stmt,
+        "return_statement": __eval_return_statement,
+        "ternary_operator": __eval_ternary_operator,
+        "while_loop_block": __eval_while_statement,
+        "repeat_loop_block": __eval_repeat_statement,
+        "unary_minus": __eval_unary_minus,
+        "negation_condition": __eval_negation_condition,
+        "array_value": __eval_array_value,
+        "const_expression_term": __eval_const_expression_term,
+    }
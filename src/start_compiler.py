@@ -8,12 +8,62 @@ import ply.yacc as yy
 import src.syntax_analyzer as syntax
 import src.lex_analyzer as lexical
 import src.pl0_code_generator as gen
-from src.generate_results import generate_output_files, save_generated_code, visualize_dst
-from src.semantics_analyzer.analyzer import Analyzer
+import src.optimizer as optimizer
+from src.generate_results import generate_output_files, save_generated_code, save_passes_report, visualize_dst
+from src.syntax_analyzer.name_resolution import annotate_types, resolve_names
 from src.syntax_analyzer.symbol_table import generate_table_of_symbols
 
+# The lexers and the parsers are built at the first compilation and reused by the next ones.
+# LALR tables of the PLY parser are cached in src/syntax_analyzer/parsetab.py, PLY generates them again
+# when the signature of the grammar or the version of the table format changes.
+lexers = {}
+parsers = {}
 
-def start_compiler(input_file_name: str, output_dir="./", show_tree_with_pyqt5=False):
+# "ply" is the lexer generated by PLY from lexer.py, "regex" is the hand-written lexer producing the same tokens,
+# "parallel" is the regex lexer scanning parts of large inputs in a pool of processes
+lexer_names = ("ply", "regex", "parallel")
+# "ply" is the LALR parser generated by PLY from parser.py, "descent" is the recursive descent parser
+# building the same tree
+parser_names = ("ply", "descent")
+
+
+def get_parser(lexer_name="ply", parser_name="ply"):
+    """
+    It returns the lexer and the parser ready to parse a new input
+
+    :param lexer_name: name of the lexer from lexer_names, defaults to "ply" (optional)
+    :param parser_name: name of the parser from parser_names, defaults to "ply" (optional)
+    """
+    if parser_name not in parsers:
+        if parser_name == "ply":
+            parsers[parser_name] = yy.yacc(module=syntax, debug=False, tabmodule="parsetab")
+        elif parser_name == "descent":
+            # parsers and lexers other than PLY are imported only when they are used
+            from src.syntax_analyzer.descent_parser import DescentParser
+            parsers[parser_name] = DescentParser()
+        else:
+            raise ValueError(f"Unknown parser {parser_name}, use one of {', '.join(parser_names)}.")
+    if lexer_name not in lexers:
+        if lexer_name == "ply":
+            lexers[lexer_name] = ply.lex.lex(module=lexical)
+        elif lexer_name == "regex":
+            from src.lex_analyzer.regex_lexer import RegexLexer
+            lexers[lexer_name] = RegexLexer()
+        elif lexer_name == "parallel":
+            # the pool of processes is imported only when it is used
+            from src.lex_analyzer.parallel_lexer import ParallelLexer
+            lexers[lexer_name] = ParallelLexer()
+        else:
+            raise ValueError(f"Unknown lexer {lexer_name}, use one of {', '.join(lexer_names)}.")
+    lexer = lexers[lexer_name]
+    # lexer counts lines of the previous input
+    lexer.lineno = 1
+    return lexer, parsers[parser_name]
+
+
+def start_compiler(input_file_name: str, output_dir="./", show_tree_with_pyqt5=False, optimization_level=0,
+                   cache_dir=None, save_tree_files=True, lexer_name="ply", stream_input=False,
+                   parser_name="ply"):
     """
     > This function takes a file name as input, and returns a list of lists of strings
 
@@ -21,38 +71,77 @@ def start_compiler(input_file_name: str, output_dir="./", show_tree_with_pyqt5=F
     :type input_file_name: str
     :param output_dir: The directory where the output files will be saved, defaults to ./ (optional)
     :param show_tree_with_pyqt5: If True, the tree will be displayed using PyQt5, defaults to False (optional)
+    :param optimization_level: 0 disables optimizations, 1 to 3 enable more optimization passes, defaults to 0 (optional)
+    :param cache_dir: directory with tables of symbols of already checked sources, defaults to None (optional)
+    :param save_tree_files: If False, the syntax tree is not saved, so ete3 is not imported, defaults to True (optional)
+    :param lexer_name: "ply", "regex" (faster hand-written lexer with the same tokens) or "parallel" (regex lexer
+    scanning parts of large inputs in a pool of processes), defaults to "ply" (optional)
+    :param stream_input: If True, the file is read in chunks while it is parsed by the regex lexer, so the source
+    is not kept in memory, defaults to False (optional)
+    :param parser_name: "ply" or "descent" (recursive descent parser building the same tree), defaults to "ply"
+    (optional)
     """
 
-    with open(input_file_name) as f:
-        formatted_input_code = f.read()
-
     # Parsing the code_input.
-    lexer = \
-        ply.lex.lex(module=lexical)
-    y = yy.yacc(module=syntax, debug=False, write_tables=False)
-    dst = y.parse(formatted_input_code)
+    if stream_input:
+        formatted_input_code = None
+        lexer, y = get_parser("regex", parser_name)
+        with open(input_file_name) as f:
+            lexer.input_file(f)
+            dst = y.parse(lexer=lexer)
+    else:
+        with open(input_file_name) as f:
+            formatted_input_code = f.read()
+        lexer, y = get_parser(lexer_name, parser_name)
+        dst = y.parse(formatted_input_code, lexer=lexer)
     if dst is None:
         raise Exception(f"Input file {input_file_name} contains an syntactical error. Compilation to PL0 is therefore not possible.")
-    # Generating a table of symbols.
-    table_of_symbols = {}
-    generate_table_of_symbols(table_of_symbols, symbols=dst.get_leaves())
+    # Unchanged source was already checked, its table of symbols is loaded from the cache.
+    table_of_symbols = None
+    if cache_dir is not None:
+        # hashing and JSON are imported only when the cache is used
+        from src.syntax_analyzer.symbol_table_cache import get_file_hash, get_source_hash, load_symbol_table, \
+            save_symbol_table
+        source_hash = get_source_hash(formatted_input_code) if formatted_input_code is not None \
+            else get_file_hash(input_file_name)
+        table_of_symbols = load_symbol_table(cache_dir, source_hash)
+    if table_of_symbols is not None:
+        # Binding identifiers to their symbols and storing types of values, the analyzer is skipped.
+        resolve_names(dst, table_of_symbols)
+        annotate_types(dst)
+    else:
+        # Generating a table of symbols and binding identifiers to their symbols in one walk.
+        table_of_symbols = {}
+        generate_table_of_symbols(table_of_symbols, dst)
+
+        # the analyzer is imported only when the table is not loaded from the cache
+        from src.semantics_analyzer.analyzer import Analyzer
+        semantics_analyzer = Analyzer(dst, table_of_symbols)
+        if not semantics_analyzer.Analyze():
+            raise Exception(f"Input file {input_file_name} contains semantical error. Compilation to PL0 is therefore not possible.")
+        # code generation changes the records, so the table is saved right after the check
+        if cache_dir is not None:
+            save_symbol_table(cache_dir, source_hash, table_of_symbols)
+
+    # Optimizing the checked tree.
+    pass_manager = optimizer.PassManager(optimization_level)
+    table_of_symbols = pass_manager.run_tree_passes(dst, table_of_symbols)
 
     generated_code = gen.Pl0(dst, table_of_symbols)
 
     # Generating the output files.
-    output_dir = generate_output_files(dst, generated_code, output_dir)
+    output_dir = generate_output_files(dst, generated_code, output_dir, save_tree_files)
 
     # Showing the tree.
     visualize_dst(dst, show_tree_with_pyqt5)
 
-    semantics_analyzer = Analyzer(dst, table_of_symbols)
-    if not semantics_analyzer.Analyze():
-        raise Exception(f"Input file {input_file_name} contains semantical error. Compilation to PL0 is therefore not possible.")
-
     # Generating the instructions for the PL/0 compiler.
-    generated_code.generate_instructions()
+    generated_code.generate_ir()
+    pass_manager.run_ir_passes(generated_code.ir)
+    generated_code.lower_ir()
 
     # Saving the generated code to a file.
-    save_generated_code(generated_code, formatted_input_code, output_dir)
+    save_generated_code(generated_code, formatted_input_code, output_dir, input_file_name)
+    save_passes_report(pass_manager, output_dir)
 
     return generated_code.return_code()
@@ -0,0 +1,122 @@
+#  date: 19. 10. 2026
+#
+
+
+# Node of the abstract syntax tree. Inner nodes are named by the grammar symbol, leaves by the value of the token.
+# It provides the part of the ete3 tree interface the compiler uses, ete3 trees are made by to_ete_tree
+# only when the tree is printed or shown.
+class AstNode:
+    __slots__ = ("name", "children", "up", "lineno", "symbol", "dtype")
+
+    def __init__(self, name=None, lineno=-1) -> None:
+        """
+        :param name: name of the grammar symbol or value of the token, None is stored as an empty name
+        :param lineno: number of line of the statement, -1 if it is not known
+        """
+        self.name = name if name is not None else ""
+        self.children = []
+        self.up = None
+        self.lineno = lineno
+        # symbol record of the identifier, it is set by the name resolution
+        self.symbol = None
+        # type of the value of the expression ("Int", "Boolean", ...), it is set by the semantic analysis
+        self.dtype = None
+
+    def add_child(self, child=None, name=None):
+        """
+        It appends the child to the children of the node, a new leaf is made if no child is given
+
+        :param child: detached node
+        :param name: name of the new leaf
+        :return: the child
+        """
+        if child is None:
+            child = AstNode(name)
+        self.children.append(child)
+        child.up = self
+        return child
+
+    def detach(self):
+        """
+        It removes the node from the children of its parent
+
+        :return: the node
+        """
+        if self.up is not None:
+            self.up.children.remove(self)
+            self.up = None
+        return self
+
+    def get_children(self) -> list:
+        """
+        It returns a new list of the children
+        """
+        return list(self.children)
+
+    def get_sisters(self) -> list:
+        """
+        It returns other children of the parent
+        """
+        if self.up is None:
+            return []
+        return [i for i in self.up.children if i is not self]
+
+    def traverse(self, strategy="preorder"):
+        """
+        It yields nodes of the subtree, parent before its children from left to right
+
+        :param strategy: only "preorder" is supported
+        """
+        if strategy != "preorder":
+            raise ValueError(f"Unsupported traversal strategy {strategy}.")
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def get_leaves(self) -> list:
+        """
+        It returns leaves of the subtree from left to right
+        """
+        return [i for i in self.traverse() if not i.children]
+
+    def get_leaf_names(self) -> list:
+        """
+        It returns names of leaves of the subtree from left to right
+        """
+        return [i.name for i in self.get_leaves()]
+
+    def copy(self):
+        """
+        It returns a copy of the subtree, bindings of identifiers are not copied, types of expressions are
+        """
+        root = AstNode(self.name, self.lineno)
+        root.dtype = self.dtype
+        stack = [(self, root)]
+        while stack:
+            node, node_copy = stack.pop()
+            for child in node.children:
+                child_copy = node_copy.add_child(AstNode(child.name, child.lineno))
+                child_copy.dtype = child.dtype
+                stack.append((child, child_copy))
+        return root
+
+
+def to_ete_tree(root):
+    """
+    It converts the subtree to an ete3 tree for printing and visualization
+
+    :param root: root of the subtree
+    """
+    from ete3 import Tree
+    ete_root = Tree(name=root.name)
+    stack = [(root, ete_root)]
+    while stack:
+        node, ete_node = stack.pop()
+        ete_node.add_feature("lineno", node.lineno)
+        if node.dtype is not None:
+            ete_node.add_feature("dtype", node.dtype)
+        for child in node.children:
+            stack.append((child, ete_node.add_child(name=child.name)))
+    return ete_root
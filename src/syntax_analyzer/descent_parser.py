@@ -0,0 +1,569 @@
+#  date: 19. 10. 2026
+#
+from src.syntax_analyzer.ast_node import AstNode
+from src.syntax_analyzer.utils import make_node, is_integer, get_integer_node_value
+
+"""
+recursive descent parser
+"""
+
+# tokens ending a list of declarations
+list_ends = {"$end", "rcparent"}
+# tokens starting a loop or a condition block
+block_keywords = {"if", "while", "repeat", "for"}
+# operators of modification of a variable
+modification_operators = {"sub", "add", "mulby", "divby", "equals"}
+relation_operators = {"equals_equals", "lt", "gt", "le", "ge", "not_equal"}
+logical_operators = {"and", "or"}
+# tokens after a value that make it a whole condition
+simple_condition_ends = {"question_mark", "lcparent", "rparent", "semicolon"}
+# tokens starting a value
+value_starts = {"int", "bool", "id", "quote", "lsparent"}
+
+
+# Parser of the grammar in parser.py that builds the same syntax tree as the PLY parser without LALR tables.
+# Every rule of the grammar is a method choosing the alternative by the next token, conflicts of the grammar
+# are decided the way PLY decides them. The PLY parser reads the next token before almost every reduction,
+# so nodes are made after the next token is read and get the same line numbers.
+class DescentParser:
+
+    def __init__(self) -> None:
+        self.lexer = None
+        # next token, None at the end of the input
+        self.lookahead = None
+        self.has_lookahead = False
+
+    def parse(self, input=None, lexer=None):
+        """
+        It parses the input, the interface is the same as of the PLY parser
+
+        :param input: source code, if it is None the lexer already has its input
+        :param lexer: lexer of the source code
+        :return: root of the syntax tree
+        """
+        if input is not None:
+            lexer.input(input)
+        self.lexer = lexer
+        self.lookahead = None
+        self.has_lookahead = False
+        root = AstNode('program')
+        root.add_child(self.dekl_list())
+        if self.peek() != "$end":
+            self.error()
+        return root
+
+    def peek(self) -> str:
+        """
+        It returns the type of the next token, "$end" at the end of the input
+        """
+        if not self.has_lookahead:
+            self.lookahead = self.lexer.token()
+            self.has_lookahead = True
+        return self.lookahead.type if self.lookahead is not None else "$end"
+
+    def next(self):
+        """
+        It returns the value of the next token and moves to the following one
+        """
+        if self.peek() == "$end":
+            self.error()
+        self.has_lookahead = False
+        return self.lookahead.value
+
+    def expect(self, token_type):
+        """
+        It returns the value of the next token if it is of the type, otherwise it raises a syntax error
+
+        :param token_type: expected type of the token
+        """
+        if self.peek() != token_type:
+            self.error()
+        return self.next()
+
+    def error(self):
+        """
+        It raises the syntax error of the next token
+        """
+        if self.lookahead is None:
+            raise Exception(f"Unexpected end of input on line {self.lexer.lineno}")
+        raise Exception(f"Unrecognized token {self.lookahead.value} on line {self.lookahead.lineno}")
+
+    def node(self, node_name, children):
+        """
+        It makes the node with the line number of the next token like a reduction of the PLY parser
+
+        :param node_name: name of the node
+        :param children: children of the node
+        """
+        self.peek()
+        return make_node(node_name, children, lineno=self.lexer.lineno)
+
+    def dekl_list(self):
+        """
+        dekl_list : dekl | expression ; | var_modification ; | var_modification ; dekl_list | dekl dekl_list | block
+
+        The rule is right recursive, so the list is parsed in a loop and the nodes are made from the end of the list,
+        all of them after the token ending the list is read, like the reductions of the PLY parser.
+        """
+        # nodes waiting for the rest of the list, tuples (name, children before the rest, name of the parent or None)
+        open_nodes = []
+        while True:
+            token = self.peek()
+            if token in ("var", "let"):
+                keyword = self.next()
+                declaration = self.var_dekl()
+                # PLY shifts only ( after the declaration, the rest of the list is then a block
+                if self.peek() == "lparent":
+                    open_nodes.append(("block_var_dekl", [keyword, declaration], "declaration"))
+                    continue
+                dekl = self.node("variable_declaration", [keyword, declaration])
+            elif token == "func":
+                dekl = self.node("function_declaration", [self.fun_dekl()])
+            elif token == "return":
+                rest = self.node("declaration", [self.return_statement()])
+                break
+            elif token == "lcparent":
+                open_nodes.append(("block", [self.comp_block()], "declaration"))
+                continue
+            elif token in block_keywords:
+                statement = self.loop_or_cond_block()
+                if self.peek() in list_ends:
+                    rest = self.node("declaration", [self.node("block_statement", [statement])])
+                    break
+                open_nodes.append(("block", [statement], "declaration"))
+                continue
+            else:
+                statement, is_modification = self.statement()
+                if self.peek() in list_ends:
+                    rest = self.node("statement", [statement])
+                    break
+                if is_modification:
+                    open_nodes.append(("var_modification_dekl", [statement], None))
+                else:
+                    open_nodes.append(("block_expression", [statement], "declaration"))
+                continue
+            if self.peek() in list_ends:
+                rest = self.node("declaration", [dekl])
+                break
+            open_nodes.append(("declaration_list", [dekl], None))
+        for node_name, children, parent_name in reversed(open_nodes):
+            rest = self.node(node_name, children + [rest])
+            if parent_name is not None:
+                rest = self.node(parent_name, [rest])
+        return rest
+
+    def block(self):
+        """
+        block : comp_block dekl_list | loop_block dekl_list | cond_block dekl_list | let var_dekl dekl_list
+              | var var_dekl dekl_list | var_modification ; dekl_list | expression ; dekl_list | return expression ;
+              | loop_block | cond_block | let var_dekl | var var_dekl | expression ; | var_modification ;
+        """
+        token = self.peek()
+        if token in ("var", "let"):
+            keyword = self.next()
+            declaration = self.var_dekl()
+            if self.peek() == "rcparent":
+                return self.node("block", [keyword, declaration])
+            return self.node("block_var_dekl", [keyword, declaration, self.dekl_list()])
+        if token == "return":
+            return self.return_statement()
+        if token == "lcparent":
+            compound_block = self.comp_block()
+            return self.node("block", [compound_block, self.dekl_list()])
+        if token in block_keywords:
+            statement = self.loop_or_cond_block()
+            if self.peek() == "rcparent":
+                return self.node("block_statement", [statement])
+            return self.node("block", [statement, self.dekl_list()])
+        statement, _ = self.statement()
+        if self.peek() == "rcparent":
+            return self.node("block_statement", [statement])
+        return self.node("block_expression", [statement, self.dekl_list()])
+
+    def statement(self) -> tuple:
+        """
+        var_modification ; | expression ;
+
+        :return: tuple (node, True if it is a modification of a variable)
+        """
+        if self.peek() == "id":
+            identifier = self.next()
+            token = self.peek()
+            if token in modification_operators or token == "lsparent":
+                statement, is_modification = self.var_modification(identifier), True
+            else:
+                statement, is_modification = self.expression(self.identifier_value(identifier)), False
+        else:
+            statement, is_modification = self.expression(), False
+        self.expect("semicolon")
+        return statement, is_modification
+
+    def var_modification(self, identifier):
+        """
+        var_modification : id sub expression | id add expression | id mulby expression | id divby expression
+                         | id equals expression | id lsparent int rsparent equals expression
+
+        :param identifier: name of the modified variable
+        """
+        if self.peek() == "lsparent":
+            self.next()
+            index = self.expect("int")
+            self.expect("rsparent")
+            operator = self.expect("equals")
+            return self.node("array_var_modification", [identifier, index, operator, self.expression()])
+        operator = self.next()
+        return self.node("var_modification", [identifier, operator, self.expression()])
+
+    def return_statement(self):
+        """
+        block : return expression ;
+        """
+        self.expect("return")
+        expression = self.expression()
+        self.expect("semicolon")
+        return self.node("return_statement", [expression])
+
+    def var_dekl(self):
+        """
+        var_dekl : id ddot dtype semicolon | id ddot dtype equals expression semicolon
+        """
+        identifier = self.expect("id")
+        self.expect("ddot")
+        data_type = self.dtype()
+        if self.peek() == "equals":
+            self.next()
+            expression = self.expression()
+            self.expect("semicolon")
+            return self.node("var_declaration_expression", [identifier, data_type, expression])
+        self.expect("semicolon")
+        return self.node("var_declaration", [identifier, data_type])
+
+    def dtype(self):
+        """
+        dtype : int_type | boolean_type | array_dekl | string_type
+        """
+        token = self.peek()
+        if token in ("int_type", "boolean_type", "string_type"):
+            return self.node("data_type", [self.next()])
+        if token == "array":
+            array = self.next()
+            self.expect("lparent")
+            size = self.expect("int")
+            self.expect("rparent")
+            return self.node("data_type", [make_node("array_type", [array, size])])
+        self.error()
+
+    def fun_dekl(self):
+        """
+        fun_dekl : func id lparent params rparent arrow dtype comp_block
+                 | func id lparent params rparent arrow Void comp_block
+        """
+        self.expect("func")
+        identifier = self.expect("id")
+        self.expect("lparent")
+        params = self.node("params", [None if self.peek() == "rparent" else self.params_var()])
+        self.expect("rparent")
+        self.expect("arrow")
+        return_type = self.next() if self.peek() == "Void" else self.dtype()
+        return self.node("function_signature", [identifier, params, return_type, self.comp_block()])
+
+    def params_var(self):
+        """
+        params_var : id ddot dtype comma params_var | id ddot dtype
+        """
+        parameters = [(self.expect("id"), self.expect("ddot"), self.dtype())]
+        while self.peek() == "comma":
+            self.next()
+            parameters.append((self.expect("id"), self.expect("ddot"), self.dtype()))
+        identifier, _, data_type = parameters.pop()
+        rest = self.node("parameter_declaration", [identifier, data_type])
+        for identifier, _, data_type in reversed(parameters):
+            rest = self.node("parameters_declaration_list", [identifier, data_type, rest])
+        return rest
+
+    def comp_block(self):
+        """
+        comp_block : lcparent block rcparent
+        """
+        self.expect("lcparent")
+        block = self.block()
+        self.expect("rcparent")
+        return self.node("compound_block", [block])
+
+    def loop_or_cond_block(self):
+        """
+        loop_block : for lparent loop_var condition semicolon step semicolon rparent comp_block
+                   | while condition comp_block | repeat comp_block while condition semicolon
+        cond_block : if lparent condition rparent comp_block | if lparent condition rparent comp_block else comp_block
+        """
+        keyword = self.next()
+        if keyword == "if":
+            self.expect("lparent")
+            condition = self.condition()
+            self.expect("rparent")
+            compound_block = self.comp_block()
+            if self.peek() == "else":
+                self.next()
+                return self.node("if_else_stmt", [condition, compound_block, self.comp_block()])
+            return self.node("if_stmt", [condition, compound_block])
+        if keyword == "while":
+            condition = self.condition()
+            return self.node("while_loop_block", [condition, self.comp_block()])
+        if keyword == "repeat":
+            compound_block = self.comp_block()
+            self.expect("while")
+            condition = self.condition()
+            self.expect("semicolon")
+            return self.node("repeat_loop_block", [compound_block, condition])
+        self.expect("lparent")
+        loop_var = self.loop_var()
+        condition = self.condition()
+        self.expect("semicolon")
+        step = self.step()
+        self.expect("semicolon")
+        self.expect("rparent")
+        return self.node("for_loop_block", [loop_var, condition, step, self.comp_block()])
+
+    def loop_var(self):
+        """
+        loop_var : var var_dekl | id semicolon
+        """
+        if self.peek() == "var":
+            keyword = self.next()
+            return self.node("loop_var", [keyword, self.var_dekl()])
+        identifier = self.expect("id")
+        self.expect("semicolon")
+        return self.node("loop_var", [identifier])
+
+    def step(self):
+        """
+        step : id add int | id sub int
+        """
+        identifier = self.expect("id")
+        if self.peek() not in ("add", "sub"):
+            self.error()
+        operator = self.next()
+        value = self.expect("int")
+        # the only reduction PLY makes before reading the next token
+        return make_node("loop_step", [identifier, operator, value], lineno=self.lexer.lineno)
+
+    def condition(self):
+        """
+        condition : expression relation_operator expression and condition
+                  | expression relation_operator expression or condition
+                  | exclamation_mark lparent condition rparent | expression relation_operator expression | val
+                  | expression and condition | expression or condition
+                  | exclamation_mark lparent condition rparent and condition
+                  | exclamation_mark lparent condition rparent or condition
+        """
+        token = self.peek()
+        if token == "exclamation_mark":
+            self.next()
+            self.expect("lparent")
+            condition = self.condition()
+            self.expect("rparent")
+            if self.peek() in logical_operators:
+                operator = self.next()
+                return self.node("compound_negation_condition", [condition, operator, self.condition()])
+            return self.node("negation_condition", [condition])
+        first = None
+        if token in value_starts:
+            if token == "id":
+                first = self.identifier_value(self.next())
+            else:
+                first = self.val()
+            if first.name != "function_call" and self.peek() in simple_condition_ends:
+                return self.node("simple_condition", [first])
+        left = self.additive_expression(first)
+        if self.peek() not in relation_operators and self.peek() not in logical_operators:
+            self.error()
+        return self.condition_tail(left)
+
+    def condition_tail(self, left):
+        """
+        It parses the rest of a condition starting with an expression
+
+        :param left: parsed expression before the operator
+        """
+        if self.peek() in logical_operators:
+            operator = self.next()
+            return self.node("id_compound_condition", [left, operator, self.condition()])
+        relation_operator = self.relation_operator()
+        # the right expression can be a ternary operator with a negated condition
+        right = self.expression() if self.peek() == "exclamation_mark" else self.additive_expression()
+        # PLY shifts another relation operator, the right expression is then a ternary operator
+        if self.peek() in relation_operators:
+            right = self.ternary(self.condition_tail(right))
+        if self.peek() in logical_operators:
+            operator = self.next()
+            return self.node("compound_condition", [left, relation_operator, right, operator, self.condition()])
+        return self.node("condition", [left, relation_operator, right])
+
+    def relation_operator(self):
+        """
+        relation_operator : equals_equals | lt | gt | le | ge | not_equal
+        """
+        if self.peek() not in relation_operators:
+            self.error()
+        return self.node("relation_operator", [self.next()])
+
+    def expression(self, first=None):
+        """
+        expression : expression minus term | expression plus term | term | ternary
+        ternary : condition question_mark expression ddot expression
+
+        :param first: parsed value or call the expression starts with (optional)
+        """
+        if first is None and self.peek() == "exclamation_mark":
+            return self.ternary(self.condition())
+        left = self.additive_expression(first)
+        token = self.peek()
+        if token in relation_operators or token in logical_operators:
+            return self.ternary(self.condition_tail(left))
+        return left
+
+    def ternary(self, condition):
+        """
+        ternary : condition question_mark expression ddot expression
+
+        :param condition: parsed condition
+        """
+        self.expect("question_mark")
+        expression_true = self.expression()
+        self.expect("ddot")
+        expression_false = self.expression()
+        return self.node("expression_term",
+                         [self.node("ternary_operator", [condition, expression_true, expression_false])])
+
+    def additive_expression(self, first=None):
+        """
+        expression : expression minus term | expression plus term | term
+
+        :param first: parsed value or call the expression starts with (optional)
+        """
+        left = self.node("expression_term", [self.term(first)])
+        while self.peek() in ("plus", "minus"):
+            operator = self.next()
+            right = self.term()
+            if is_integer(left) and is_integer(right):
+                value = get_integer_node_value(left) + get_integer_node_value(right) if operator == "+" \
+                    else get_integer_node_value(left) - get_integer_node_value(right)
+                left = self.node("const_expression_term", [value])
+            else:
+                left = self.node("expression_sum" if operator == "+" else "expression_minus", [left, right])
+        return left
+
+    def term(self, first=None):
+        """
+        term : term multiply factor | term divide factor | factor
+
+        :param first: parsed value or call the term starts with (optional)
+        """
+        left = self.node("factor", [self.factor(first)])
+        while self.peek() in ("multiply", "divide"):
+            operator = self.next()
+            right = self.factor()
+            if is_integer(left) and is_integer(right):
+                value = get_integer_node_value(left) * get_integer_node_value(right) if operator == "*" \
+                    else get_integer_node_value(left) // get_integer_node_value(right)
+                left = self.node("const_expression_term", [value])
+            else:
+                left = self.node("expression_multiply" if operator == "*" else "expression_divide", [left, right])
+        return left
+
+    def factor(self, first=None):
+        """
+        factor : lparent expression rparent | minus expression %prec uminus | val | call
+
+        :param first: parsed value or call (optional)
+        """
+        if first is not None:
+            return self.node("factor_expression", [first])
+        token = self.peek()
+        if token == "lparent":
+            self.next()
+            expression = self.expression()
+            self.expect("rparent")
+            return self.node("expression_in_parent", [expression])
+        if token == "minus":
+            operator = self.next()
+            # unary minus binds stronger than + and -, so its expression is a single term or a ternary operator
+            # with a negated condition
+            if self.peek() == "exclamation_mark":
+                expression = self.expression()
+            else:
+                expression = self.node("expression_term", [self.term()])
+            if is_integer(expression):
+                return self.node("const_expression_term", [-get_integer_node_value(expression)])
+            return self.node("unary_minus", [operator, expression])
+        if token == "id":
+            return self.node("factor_expression", [self.identifier_value(self.next())])
+        return self.node("factor_expression", [self.val()])
+
+    def identifier_value(self, identifier):
+        """
+        val : id
+        call : id lparent arguments rparent
+
+        :param identifier: name read before
+        """
+        if self.peek() != "lparent":
+            return self.node("var_value_identifier", [identifier])
+        self.next()
+        arguments = self.arguments()
+        self.expect("rparent")
+        return self.node("function_call", [identifier, arguments])
+
+    def arguments(self):
+        """
+        arguments : val comma arguments | val | empty
+        """
+        values = []
+        while self.peek() != "rparent":
+            values.append(self.val())
+            if self.peek() != "comma":
+                break
+            self.next()
+        else:
+            # empty arguments, or a comma before the parenthesis
+            values.append(None)
+        rest = self.node("argument", [values.pop()])
+        for value in reversed(values):
+            rest = self.node("arguments_list", [value, rest])
+        return rest
+
+    def val(self):
+        """
+        val : int | bool | id | quote id quote | lsparent integer_list rsparent
+        """
+        token = self.peek()
+        if token == "int":
+            return self.node("var_value", [int(self.next())])
+        if token == "bool":
+            return self.node("var_value_boolean", [1 if self.next() == "true" else 0])
+        if token == "id":
+            return self.node("var_value_identifier", [self.next()])
+        if token == "quote":
+            self.next()
+            identifier = self.expect("id")
+            self.expect("quote")
+            return self.node("var_value_string", [identifier, len(identifier)])
+        if token == "lsparent":
+            self.next()
+            integer_list = self.integer_list()
+            self.expect("rsparent")
+            return self.node("array_value", [integer_list])
+        self.error()
+
+    def integer_list(self):
+        """
+        integer_list : int comma integer_list | int
+        """
+        values = [self.expect("int")]
+        while self.peek() == "comma":
+            self.next()
+            values.append(self.expect("int"))
+        rest = self.node("integer_list_tail", [values.pop()])
+        for value in reversed(values):
+            rest = self.node("integer_list", [value, rest])
+        return rest
@@ -0,0 +1,83 @@
+#  date: 19. 10. 2026
+#
+from src.syntax_analyzer.symbol_table import find_entry_in_symbol_table, identifier_nodes
+
+
+def get_symbol(node):
+    """
+    It returns the symbol record bound to the identifier of the node by generate_table_of_symbols or resolve_names
+
+    :param node: node from identifier_nodes or function_signature
+    :return: symbol record or None if the identifier is not declared
+    """
+    return node.children[0].symbol
+
+
+def resolve_names(dst, symbol_table) -> int:
+    """
+    It binds every identifier occurrence to its symbol record, so later phases do not search the table of symbols.
+    generate_table_of_symbols binds the identifiers itself, this is used for a table loaded from the cache.
+    The record is stored as the attribute symbol of the identifier leaf, None marks an undeclared identifier.
+    Names of declared functions are bound to the records of the functions.
+    The tree is walked once with the scope (0 or name of function) and the number of enclosing compound blocks.
+
+    :param dst: syntax tree
+    :param symbol_table: table of symbols of the tree
+    :return: number of bound identifiers
+    """
+    bound = 0
+    stack = [(dst, 0, 0)]
+    while stack:
+        node, scope, real_level = stack.pop()
+        if node.name in identifier_nodes and node.children:
+            identifier = node.children[0]
+            identifier.symbol = find_entry_in_symbol_table(symbol_table, scope, real_level, identifier.name)
+            bound += 1
+        elif node.name == "function_signature":
+            scope = node.children[0].name
+            # records of functions are in the global part of the table
+            node.children[0].symbol = symbol_table.get(scope)
+            bound += 1
+        elif node.name == "compound_block":
+            real_level += 1
+        stack.extend((i, scope, real_level) for i in reversed(node.children))
+    return bound
+
+
+# types of literals, they do not depend on the rest of the tree
+literal_types = {"var_value": "Int", "const_expression_term": "Int", "var_value_boolean": "Boolean",
+                 "var_value_string": "String", "array_value": "Array"}
+
+# nodes whose value is the value of the child with the given index
+forwarding_nodes = {"expression_term": 0, "factor": 0, "factor_expression": 0, "expression_in_parent": 0,
+                    "expression_sum": 0, "expression_minus": 0, "expression_multiply": 0, "expression_divide": 0,
+                    "unary_minus": 1, "ternary_operator": 1}
+
+
+def annotate_types(dst) -> int:
+    """
+    It stores the type of every value to the attribute dtype of its node, the type is given by the subtree of the node.
+    Literals have fixed types, identifiers and calls take types of their bound symbols, operands of arithmetic
+    and both branches of the ternary operator have the same type in a checked tree, so other nodes take the type
+    of one child. Identifiers must be bound by generate_table_of_symbols or resolve_names.
+
+    :param dst: syntax tree
+    :return: number of typed nodes
+    """
+    typed = 0
+    # children are typed before their parents, the tree is walked in reversed preorder
+    for node in reversed(list(dst.traverse())):
+        if node.name in literal_types:
+            node.dtype = literal_types[node.name]
+        elif node.name == "var_value_identifier":
+            symbol = get_symbol(node)
+            node.dtype = symbol.type if symbol is not None else None
+        elif node.name == "function_call":
+            symbol = get_symbol(node)
+            node.dtype = symbol.return_type if symbol is not None else None
+        elif node.name in forwarding_nodes:
+            node.dtype = node.children[forwarding_nodes[node.name]].dtype
+        else:
+            continue
+        typed += 1
+    return typed
@@ -3,9 +3,8 @@
 #
 
 
-from ete3 import Tree
-
 from src.lex_analyzer.lexer import tokens  # foreign import do not delete
+from src.syntax_analyzer.ast_node import AstNode
 from src.syntax_analyzer.utils import make_node,is_integer,get_integer_node_value
 
 """
@@ -26,7 +25,7 @@ precedence = (
 # entry point of program, the 'root' of the tree
 def p_program(p):
     """program : dekl_list"""
-    root = Tree(name='program')
+    root = AstNode('program')
     root.add_child(p[1])
     p[0] = root
 
@@ -1,9 +1,26 @@
 #  date: 29. 12. 2022
 #  author: Daniel Schnurpfeil
 #
+import sys
+from itertools import count
+
+# source of dense symbol ids, it is restarted for every table of symbols so the ids do not depend on the run
+symbol_ids = count()
+
+
+def reset_symbol_ids():
+    """
+    It makes the next created record get the id 0
+    """
+    global symbol_ids
+    symbol_ids = count()
+
 
 # This class is used to store information about a symbol in table
 class SymbolRecord:
+    # records are created for every symbol of the program, slots keep them small
+    __slots__ = ("id", "name", "type", "const", "level", "real_level", "address", "size", "lineno", "param",
+                 "tree_position", "params", "return_type", "locals")
 
     def __init__(self, name, symbol_type, const=False, level=0, real_level=0, address=3, size=0,
                  params=None, return_type=None, param=False, tree_position=0, locals_vars=None,lineno=False):
@@ -20,8 +37,9 @@ class SymbolRecord:
         :param return_type: The return type of the function
         :param param: name of the variable, defaults to False (optional)
         """
-        self.id = id(self)
-        self.name = name
+        self.id = next(symbol_ids)
+        # names are compared in every lookup, interned names are compared by identity
+        self.name = sys.intern(name) if type(name) is str else name
         self.type = symbol_type
         self.const = const
         self.level = level
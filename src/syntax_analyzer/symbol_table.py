@@ -1,15 +1,11 @@
 #  date: 29. 12. 2022
 #  author: Daniel Schnurpfeil
 #
-from src.syntax_analyzer.symbol_record import SymbolRecord
+from src.syntax_analyzer.symbol_record import SymbolRecord, reset_symbol_ids
 
-
-def find_real_level(symbols, index):
-    real_level_result = 0
-    for i in symbols[index].get_ancestors():
-        if i.name == "compound_block":
-            real_level_result += 1
-    return real_level_result
+# nodes whose first child is an identifier referring to a symbol
+identifier_nodes = {"var_value_identifier", "var_modification", "array_var_modification", "loop_step",
+                    "var_declaration", "var_declaration_expression", "function_call"}
 
 
 def find_entry_in_symbol_table(symbol_table, level, real_level, symbol_name):
@@ -60,141 +56,164 @@ def find_entry_in_symbol_table(symbol_table, level, real_level, symbol_name):
         return None
 
 
-# first run through the tree to generate table of symbols
-def generate_table_of_symbols(symbol_table, symbols: list, level="0", real_level=0, address=3, index=0):
+def get_declared_type(data_type):
+    """
+    It returns the type and the size of a variable declared with the data type
+
+    :param data_type: data_type node
+    :return: tuple (name of the type, size)
+    """
+    symbol_type = data_type.children[0]
+    # the subtree for array type is deeper than for any other type
+    if symbol_type.name == "array_type":
+        return symbol_type.children[0].name, symbol_type.children[1].name
+    return symbol_type.name, 1
+
+
+def get_parameters(params) -> list:
+    """
+    It returns the declared parameters of the function in order
+
+    :param params: params node
+    :return: list of tuples (name, data_type node)
+    """
+    parameters = []
+    node = params.children[0]
+    while node.name == "parameters_declaration_list" or node.name == "parameter_declaration":
+        parameters.append((node.children[0].name, node.children[1]))
+        if node.name == "parameter_declaration":
+            break
+        node = node.children[2]
+    return parameters
+
+
+def get_scope_dictionary(symbol_table, level, real_level) -> dict:
+    """
+    It returns the dictionary of symbols declared in the scope, missing indented scopes are created
+
+    :param symbol_table: table of symbols
+    :param level: "0" for global scope or name of the function
+    :param real_level: number of compound blocks around the declaration
+    """
+    if level == "0":
+        if real_level == 0:
+            return symbol_table
+        scopes = symbol_table["_scopes"]
+    else:
+        # stack of local variables inside function scope
+        if symbol_table[level].locals is None:
+            symbol_table[level].locals = []
+        scopes = symbol_table[level].locals
+    while real_level > len(scopes):
+        scopes.append({})
+    return scopes[real_level - 1]
+
+
+def declare_function(symbol_table, node, level, real_level, addresses, position):
+    """
+    It adds the function and its parameters to the table of symbols
+
+    :param symbol_table: table of symbols
+    :param node: function_signature node
+    :param level: "0" for global scope or name of the function the function is declared in
+    :param real_level: number of compound blocks around the declaration
+    :param addresses: next free address in every scope
+    :param position: index of the leaf with name of the function
+    """
+    name, params, return_type = node.children[0].name, node.children[1], node.children[2]
+    if name in symbol_table:
+        raise Exception("Duplicate symbol:", name, "in", symbol_table.keys())
+    # Void is a leaf without a line number
+    lineno = return_type.lineno if return_type.children else params.lineno
+    parameters = {}
+    local_address = 3
+    for parameter_name, data_type in get_parameters(params):
+        if parameter_name in parameters:
+            raise Exception("Duplicate symbol:", parameter_name, "in", parameters.keys())
+        dtype, size = get_declared_type(data_type)
+        parameters[parameter_name] = SymbolRecord(parameter_name, dtype, size=size, param=True, level=level,
+                                                  tree_position=position, real_level=real_level, lineno=lineno,
+                                                  address=local_address)
+        local_address += 1
+    symbol_table[name] = SymbolRecord(name, "func", params=parameters, level=level, real_level=real_level,
+                                      tree_position=position, address=addresses[level], lineno=lineno,
+                                      return_type=return_type.get_leaf_names()[0])
+    addresses[level] += 1
+    addresses[name] = local_address
+
+
+def declare_variable(symbol_table, node, level, real_level, addresses, position):
+    """
+    It adds the variable to the scope it is declared in
+
+    :param symbol_table: table of symbols
+    :param node: var_declaration or var_declaration_expression node
+    :param level: "0" for global scope or name of the function the variable is declared in
+    :param real_level: number of compound blocks around the declaration
+    :param addresses: next free address in every scope
+    :param position: index of the leaf with name of the variable
+    """
+    name, data_type = node.children[0].name, node.children[1]
+    dic = get_scope_dictionary(symbol_table, level, real_level)
+    if name in dic:
+        raise Exception("Duplicate symbol:", name, "in", dic.keys())
+    symbol_type, size = get_declared_type(data_type)
+    dic[name] = SymbolRecord(name, symbol_type=symbol_type, size=size, lineno=data_type.lineno, level=level,
+                             real_level=real_level, tree_position=position, address=addresses[level])
+    # declaration follows the var or let keyword
+    if node.up.children[0].name == "let":
+        dic[name].const = True
+    addresses[level] += 1
+
+
+def generate_table_of_symbols(symbol_table, dst) -> int:
+    """
+    It generates a table of symbols and binds identifiers to their symbol records in one walk of the tree.
+    Global symbols are stored directly in the table, symbols declared in indented blocks of the global scope
+    in the list "_scopes" and symbols of functions in their records, one dictionary for every indentation.
+    An identifier is bound when it is reached, the names declared later (eg. functions called before their
+    declaration) are bound again at the end, so every identifier is bound as if the whole table was known.
+
+    :param symbol_table: dictionary to fill
+    :param dst: syntax tree
+    :return: number of bound identifiers
     """
-        It generates a table of symbols
-        """
-    position_in_tree = index
-    index = 0
+    reset_symbol_ids()
     # [JT] indented scopes in global scope
     symbol_table["_scopes"] = []
-    while index < len(symbols):
-        ancestor = symbols[index].get_ancestors()[0]
-        if ancestor.name == "function_signature":
-            real_level = find_real_level(symbols, index)
-            if symbols[index].name in symbol_table.keys():
-                raise Exception("Duplicate symbol:", symbols[index].name, "in", symbol_table.keys())
-            params = {}
-            local_address = 3
-            ids_and_types = symbols[index].get_sisters()[0].get_leaf_names()
-            lineno = symbols[index].get_sisters()[1].lineno
-            if len(ids_and_types) > 1:
-                i = 0
-                # [JT] while loop had to be used instead of for loop so i could dynamically change the driving variable 'i'
-                while i < len(ids_and_types):
-                    identifier_name = ids_and_types[i]
-                    # [JT] array parameters consists of 3 values, name, type, size.
-                    # If i pointer hits the type or size, we want to force another iteration
-                    if identifier_name == "Array":
-                        continue
-                    if type(identifier_name) is int:
-                        i += 1
-                        if i >= len(ids_and_types):
-                            break
-                        identifier_name = ids_and_types[i]
-
-                    dtype = ids_and_types[i + 1]
-                    size = 1
-                    if dtype == "Array":
-                        size = ids_and_types[i + 2]
-                    if ids_and_types[i] in params.keys():
-                        raise Exception("Duplicate symbol:", ids_and_types[i], "in", params.keys())
-
-                    params[ids_and_types[i]] = (
-                        SymbolRecord(identifier_name, dtype, size=size, param=True, level=level,
-                                     tree_position=position_in_tree + index,
-                                     real_level=real_level, lineno=lineno,
-                                     address=local_address))
-                    i += 2
-
-                    local_address += 1
-            func_name = symbols[index].name
-            symbol_table[func_name] = (
-                SymbolRecord(symbols[index].name, "func", params=params, level=level, real_level=real_level,
-                             tree_position=position_in_tree + index,
-                             address=address,
-                             lineno=lineno,
-                             return_type=symbols[index].get_sisters()[1].get_leaf_names()[0]))
-            address += 1
-            func_body = symbols[index].get_sisters()[2].get_leaves()
-            # shifting index to skip duplicates
-            index += len(func_body)
-            # recursive call
-            generate_table_of_symbols(symbol_table, level=symbol_table[func_name].name, real_level=real_level,
-                                      symbols=func_body, address=local_address, index=index)
-
-        if ancestor.name == "var_declaration_expression" or ancestor.name == "var_declaration":
-            real_level = find_real_level(symbols, index)
-            lineno = symbols[index].get_sisters()[0].lineno
-            if level != "0" and symbol_table[level].locals is None:
-                # stack of local variables inside function scope
-                symbol_table[level].locals = []
-                symbol_type = symbols[index].get_sisters()[0].children[0]
-                size = 1
-                # workaround for array_type, because the subtree for array type is deeper than for any other type
-                if symbol_type.name == "array_type":
-                    tmp = symbol_type.get_children()
-                    symbol_type = tmp[0]
-                    size = tmp[1].name
-                symbol_table[level].locals.append({symbols[index].name: (SymbolRecord(symbols[index].name,
-                                                                                      symbol_type=symbol_type.name,
-                                                                                      level=level,
-                                                                                      size=size,
-                                                                                      lineno=lineno,
-                                                                                      real_level=real_level,
-                                                                                      tree_position=position_in_tree + index,
-                                                                                      address=address))})
-                if ancestor.get_sisters()[0].name == "let":
-                    symbol_table[level].locals[real_level - 1][symbols[index].name].const = True
-            elif level != "0":
-                # if we are indented inside local scope of function, we push a new map into stack
-                if real_level > len(symbol_table[level].locals):
-                    symbol_table[level].locals.append({})
-                current_scope_dic = symbol_table[level].locals[real_level - 1]
-                if symbols[index].name in current_scope_dic.keys():
-                    raise Exception("Duplicate symbol:", symbols[index].name, "in", current_scope_dic.keys())
-                symbol_type = symbols[index].get_sisters()[0].children[0]
-                size = 1
-                if symbol_type.name == "array_type":
-                    tmp = symbol_type.get_children()
-                    symbol_type = tmp[0]
-                    size = tmp[1].name
-                current_scope_dic[symbols[index].name] = (SymbolRecord(symbols[index].name,
-                                                                       symbol_type=symbol_type.name,
-                                                                       level=level,
-                                                                       size=size,
-                                                                       real_level=real_level,
-                                                                       tree_position=position_in_tree + index,
-                                                                       address=address))
-                if ancestor.get_sisters()[0].name == "let":
-                    current_scope_dic[symbols[index].name].const = True
-            else:
-
-                dic = symbol_table
-                if real_level != 0:
-                    if real_level > len(symbol_table["_scopes"]):
-                        symbol_table["_scopes"].append({})
-                    dic = symbol_table["_scopes"][real_level - 1]
-                if symbols[index].name in dic.keys():
-                    raise Exception("Duplicate symbol:", symbols[index].name, "in", symbol_table.keys())
-                symbol_type = symbols[index].get_sisters()[0].children[0]
-                size = 1
-                if symbol_type.name == "array_type":
-                    tmp = symbol_type.get_children()
-                    symbol_type = tmp[0]
-                    size = tmp[1].name
-                lineno = symbols[index].get_sisters()[0].lineno
-                dic[symbols[index].name] = (SymbolRecord(symbols[index].name,
-                                                         symbol_type=symbol_type.name,
-                                                         size=size,
-                                                         lineno=lineno,
-                                                         level=level,
-                                                         real_level=real_level,
-                                                         tree_position=position_in_tree + index,
-                                                         address=address))
-
-                if ancestor.get_sisters()[0].name == "let":
-                    dic[symbols[index].name].const = True
-            address += 1
-        index += 1
+    # next free address in the global scope and in every function
+    addresses = {"0": 3}
+    # number of declarations of every name and the bound identifiers with the number at their place
+    declarations = {}
+    bound = []
+    # number of visited leaves, it is the position of the next declared name among leaves
+    position = 0
+    stack = [(dst, "0", 0)]
+    while stack:
+        node, level, real_level = stack.pop()
+        if not node.children:
+            position += 1
+            continue
+        if node.name == "function_signature":
+            declare_function(symbol_table, node, level, real_level, addresses, position)
+            level = node.children[0].name
+            node.children[0].symbol = symbol_table[level]
+            declarations[level] = declarations.get(level, 0) + 1
+            bound.append((node.children[0], 0, 0, declarations[level]))
+        elif node.name in identifier_nodes:
+            identifier = node.children[0]
+            if node.name == "var_declaration_expression" or node.name == "var_declaration":
+                declare_variable(symbol_table, node, level, real_level, addresses, position)
+                declarations[identifier.name] = declarations.get(identifier.name, 0) + 1
+            # lookup uses 0 for the global scope
+            scope = 0 if level == "0" else level
+            identifier.symbol = find_entry_in_symbol_table(symbol_table, scope, real_level, identifier.name)
+            bound.append((identifier, scope, real_level, declarations.get(identifier.name, 0)))
+        elif node.name == "compound_block":
+            real_level += 1
+        for child in reversed(node.children):
+            stack.append((child, level, real_level))
+    for identifier, scope, real_level, declared in bound:
+        if declarations.get(identifier.name, 0) != declared:
+            identifier.symbol = find_entry_in_symbol_table(symbol_table, scope, real_level, identifier.name)
+    return len(bound)
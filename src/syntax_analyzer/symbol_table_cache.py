@@ -0,0 +1,124 @@
+#  date: 19. 10. 2026
+#
+import hashlib
+import json
+import os
+
+from src.syntax_analyzer.symbol_record import SymbolRecord, reset_symbol_ids
+
+# version of the format of cached tables, tables of other versions are not loaded
+cache_version = 1
+
+# fields of every record in the order they are stored, functions also store params, return_type and locals
+record_fields = ("id", "name", "type", "const", "level", "real_level", "address", "size", "lineno", "param",
+                 "tree_position")
+
+
+def get_source_hash(source) -> str:
+    """
+    It returns the key of the source code in the cache
+
+    :param source: source code of the compiled file
+    """
+    return hashlib.sha256((str(cache_version) + "\n" + source).encode()).hexdigest()
+
+
+def get_file_hash(file_name, size=1 << 16) -> str:
+    """
+    It returns the same key as get_source_hash for the content of the file, the file is read in chunks
+
+    :param file_name: path to the compiled file
+    :param size: number of characters read at once, defaults to 65536 (optional)
+    """
+    source_hash = hashlib.sha256((str(cache_version) + "\n").encode())
+    with open(file_name) as f:
+        for chunk in iter(lambda: f.read(size), ""):
+            source_hash.update(chunk.encode())
+    return source_hash.hexdigest()
+
+
+def record_to_list(record) -> list:
+    """
+    It converts the symbol record to a list of its fields
+
+    :param record: symbol record
+    """
+    data = [getattr(record, i) for i in record_fields]
+    if record.type == "func":
+        data.append({name: record_to_list(i) for name, i in record.params.items()})
+        data.append(record.return_type)
+        data.append(None if record.locals is None else
+                    [{name: record_to_list(i) for name, i in scope.items()} for scope in record.locals])
+    return data
+
+
+def record_from_list(data) -> SymbolRecord:
+    """
+    It makes the symbol record from the list made by record_to_list
+
+    :param data: list of fields of the record
+    """
+    record = SymbolRecord(data[1], data[2])
+    for name, value in zip(record_fields, data):
+        setattr(record, name, value)
+    if record.type == "func":
+        params, record.return_type, scopes = data[len(record_fields):]
+        record.params = {name: record_from_list(i) for name, i in params.items()}
+        record.locals = None if scopes is None else \
+            [{name: record_from_list(i) for name, i in scope.items()} for scope in scopes]
+    return record
+
+
+def symbol_table_to_dict(symbol_table) -> dict:
+    """
+    It converts the table of symbols to a structure that can be saved as JSON
+
+    :param symbol_table: table of symbols
+    """
+    return {"_scopes": [{name: record_to_list(i) for name, i in scope.items()} for scope in symbol_table["_scopes"]],
+            "symbols": {name: record_to_list(i) for name, i in symbol_table.items() if name != "_scopes"}}
+
+
+def symbol_table_from_dict(data) -> dict:
+    """
+    It makes the table of symbols from the structure made by symbol_table_to_dict
+
+    :param data: saved table of symbols
+    """
+    reset_symbol_ids()
+    symbol_table = {"_scopes": [{name: record_from_list(i) for name, i in scope.items()} for scope in data["_scopes"]]}
+    for name, i in data["symbols"].items():
+        symbol_table[name] = record_from_list(i)
+    return symbol_table
+
+
+def save_symbol_table(cache_dir, source_hash, symbol_table):
+    """
+    It saves the table of symbols of a checked program to the cache
+
+    :param cache_dir: directory of the cache, it is created if it does not exist
+    :param source_hash: key of the source code
+    :param symbol_table: table of symbols
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(os.path.join(cache_dir, source_hash + ".json"), mode="w") as f:
+        json.dump({"version": cache_version, "table": symbol_table_to_dict(symbol_table)}, f,
+                  separators=(",", ":"))
+
+
+def load_symbol_table(cache_dir, source_hash):
+    """
+    It loads the table of symbols of the source code from the cache
+
+    :param cache_dir: directory of the cache
+    :param source_hash: key of the source code
+    :return: table of symbols or None if it is not cached
+    """
+    try:
+        with open(os.path.join(cache_dir, source_hash + ".json")) as f:
+            data = json.load(f)
+        if data["version"] != cache_version:
+            return None
+        return symbol_table_from_dict(data["table"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
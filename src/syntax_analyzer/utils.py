@@ -2,14 +2,14 @@
 #  author: Daniel Schnurpfeil
 #
 
-from ete3 import Tree
+from src.syntax_analyzer.ast_node import AstNode
 
 # no idea how to propagate lineno through nodes, so i have to make a custom map for it
 line_numbers = {}
 
 
 # [JT] lineno = number of line where the statement is declared
-def make_node(node_name: str, children=None, lineno=-1) -> Tree:
+def make_node(node_name: str, children=None, lineno=-1) -> AstNode:
     """
     It takes a node name and a list of children, and returns a tree
 
@@ -18,12 +18,11 @@ def make_node(node_name: str, children=None, lineno=-1) -> Tree:
     :param children: A list of children to add to the node
     :return: A tree with the name of the node and the children
     """
-    ast = Tree(name=node_name)
-    ast.add_feature('lineno',lineno)
+    ast = AstNode(node_name, lineno)
     if children is None:
         return ast
     for i in children:
-        if i.__class__.__name__ == 'TreeNode':
+        if isinstance(i, AstNode):
             ast.add_child(child=i)
         else:
             ast.add_child(name=i)
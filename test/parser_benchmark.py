@@ -0,0 +1,57 @@
+#  date: 19. 10. 2026
+#
+# Time of parsing with the PLY parser and the recursive descent parser, both with every lexer.
+# Run from the test directory: python parser_benchmark.py [input file] [copies of the input] [number of runs]
+
+import os
+import sys
+import time
+
+root_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, root_dir)
+
+from src.start_compiler import get_parser, lexer_names, parser_names
+
+
+def measure(code, lexer_name, parser_name, runs) -> float:
+    """
+    It returns the shortest time of parsing the code in seconds
+
+    :param code: source code
+    :param lexer_name: name of the lexer
+    :param parser_name: name of the parser
+    :param runs: number of measured runs
+    """
+    times = []
+    for _ in range(runs):
+        lexer, parser = get_parser(lexer_name, parser_name)
+        start = time.perf_counter()
+        parser.parse(code, lexer=lexer)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def benchmark(input_file, copies, runs):
+    """
+    It prints the time of parsing for every parser and lexer
+
+    :param input_file: parsed file
+    :param copies: the input is repeated to get a larger source
+    :param runs: number of measured runs
+    """
+    with open(input_file) as f:
+        code = f.read() * copies
+    print(f"{input_file} x {copies}: {len(code) / 1000:.0f} kB, {code.count(chr(10)) + 1} lines")
+    # the parsers and lexers are built before the measurement
+    for parser_name in parser_names:
+        for lexer_name in lexer_names:
+            get_parser(lexer_name, parser_name)
+            print(f"  {parser_name:8} parser, {lexer_name:5} lexer: "
+                  f"{measure(code, lexer_name, parser_name, runs) * 1000:8.1f} ms (best of {runs} runs)")
+
+
+if __name__ == '__main__':
+    benchmark(os.path.abspath(sys.argv[1]) if len(sys.argv) > 1 else os.path.join(root_dir, "sample_input",
+                                                                                 "program.swift"),
+              int(sys.argv[2]) if len(sys.argv) > 2 else 100,
+              int(sys.argv[3]) if len(sys.argv) > 3 else 5)
@@ -0,0 +1,72 @@
+#  date: 19. 10. 2026
+#
+# Startup time of the compiler run as a separate process, the way build scripts run it for every file.
+# Run from the test directory: python startup_benchmark.py [input file] [number of runs]
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+root_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+compiler = os.path.join(root_dir, "not_so_swift_compiler.py")
+
+
+def parse_import_times(stderr) -> list:
+    """
+    It parses the output of python -X importtime
+
+    :param stderr: error output of the process
+    :return: list of tuples (cumulative time in microseconds, module), the slowest first
+    """
+    times = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        times.append((int(cumulative), module[1:].rstrip()))
+    return sorted(times, reverse=True)
+
+
+def run_compiler(arguments, import_time=False):
+    """
+    It runs the compiler in a new process
+
+    :param arguments: arguments of the compiler
+    :param import_time: If True, the process reports time of imports
+    :return: tuple (seconds, error output)
+    """
+    command = [sys.executable] + (["-X", "importtime"] if import_time else []) + [compiler] + arguments
+    start = time.perf_counter()
+    process = subprocess.run(command, cwd=root_dir, capture_output=True, text=True)
+    duration = time.perf_counter() - start
+    if process.returncode != 0:
+        raise Exception(process.stderr)
+    return duration, process.stderr
+
+
+def benchmark(input_file, runs):
+    """
+    It prints the slowest imports and the mean time of compilation with and without saving the tree
+
+    :param input_file: compiled file
+    :param runs: number of measured runs
+    """
+    with tempfile.TemporaryDirectory() as output_dir:
+        for name, options in (("with tree files", []), ("without tree files", ["-nt"])):
+            arguments = ["-i", input_file, "-o", output_dir + "/"] + options
+            _, stderr = run_compiler(arguments, import_time=True)
+            times = parse_import_times(stderr)
+            top_level = sum(i for i, module in times if not module.startswith(" "))
+            print(f"{name}: imports {top_level / 1000:.1f} ms")
+            for cumulative, module in times[:10]:
+                print(f"  {cumulative / 1000:8.1f} ms {module}")
+            total = sum(run_compiler(arguments)[0] for _ in range(runs))
+            print(f"  whole compilation {total / runs * 1000:.1f} ms (mean of {runs} runs)")
+
+
+if __name__ == '__main__':
+    benchmark(os.path.abspath(sys.argv[1]) if len(sys.argv) > 1 else os.path.join(root_dir, "sample_input",
+                                                                                 "program.swift"),
+              int(sys.argv[2]) if len(sys.argv) > 2 else 5)
@@ -3,9 +3,55 @@
 #
 # all testcases are validated with https://home.zcu.cz/~lipka/fjp/pl0/
 
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from glob import glob
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 
-from src.start_compiler import start_compiler
+from src.batch_compiler import compile_batch, summary_file_name
+from src.lex_analyzer.parallel_lexer import ParallelLexer
+from src.lex_analyzer.regex_lexer import RegexLexer
+from src.optimizer import PassManager, max_optimization_level
+from src.pl0_code_generator import Pl0
+from src.pl0_vm.p_machine import run_pl0_code
+from src.semantics_analyzer.analyzer import Analyzer
+from src.start_compiler import get_parser, lexer_names, parser_names, start_compiler
+from src.syntax_analyzer.name_resolution import annotate_types, resolve_names
+from src.syntax_analyzer.symbol_table import generate_table_of_symbols
+
+
+def compile_program(code, optimization_level=0) -> Pl0:
+    """
+    It compiles the program and returns the generator with its instructions
+
+    :param code: source of the program
+    :param optimization_level: optimization level of the compilation
+    """
+    lexer, parser = get_parser()
+    dst = parser.parse(code, lexer=lexer)
+    table_of_symbols = {}
+    generate_table_of_symbols(table_of_symbols, dst)
+    Analyzer(dst, table_of_symbols).Analyze()
+    table_of_symbols = PassManager(optimization_level).run_tree_passes(dst, table_of_symbols)
+    generated_code = Pl0(dst, table_of_symbols)
+    generated_code.generate_instructions()
+    return generated_code
+
+
+def run_program(code, optimization_level) -> dict:
+    """
+    It compiles the program, runs it in the PL/0 machine and returns values of global variables at the end
+
+    :param code: source of the program
+    :param optimization_level: optimization level of the compilation
+    """
+    generated_code = compile_program(code, optimization_level)
+    stack = [int(i.split("\t")[1]) for i in run_pl0_code(generated_code.code).splitlines()]
+    return {name: stack[symbol.address] for name, symbol in generated_code.symbol_table.items()
+            if getattr(symbol, "type", None) == "Int" and not name.startswith("_")}
 
 
 # It's a class that inherits from the TestCase class, and it's called Test
@@ -115,23 +161,21 @@ class Test(TestCase):
 3 STO 0 3
 4 LOD 0 3
 5 LIT 0 5
-6 OPR 0 12
-7 LIT 0 -1
-8 OPR 0 2
-9 JMC 0 18
-10 LIT 0 52
-11 LIT 0 43
-12 OPR 0 12
-13 JMC 0 22
-14 LOD 0 3
-15 LIT 0 5
-16 OPR 0 10
-17 JMC 0 22
-18 LIT 0 32
-19 LOD 0 3
-20 OPR 0 4
-21 STO 0 3
-22 RET 0 0
+6 OPR 0 13
+7 JMC 0 16
+8 LIT 0 52
+9 LIT 0 43
+10 OPR 0 12
+11 JMC 0 20
+12 LOD 0 3
+13 LIT 0 5
+14 OPR 0 10
+15 JMC 0 20
+16 LIT 0 32
+17 LOD 0 3
+18 OPR 0 4
+19 STO 0 3
+20 RET 0 0
 """, code, "if_and_or")
 
     def test_if_or(self):
@@ -142,25 +186,21 @@ class Test(TestCase):
 3 STO 0 3
 4 LOD 0 3
 5 LIT 0 5
-6 OPR 0 12
-7 LIT 0 -1
-8 OPR 0 2
-9 JMC 0 20
-10 LIT 0 52
-11 LIT 0 43
-12 OPR 0 12
-13 LIT 0 -1
-14 OPR 0 2
+6 OPR 0 13
+7 JMC 0 16
+8 LIT 0 52
+9 LIT 0 43
+10 OPR 0 13
+11 JMC 0 16
+12 LIT 0 1
+13 LIT 0 1
+14 OPR 0 12
 15 JMC 0 20
-16 LIT 0 1
-17 LIT 0 1
-18 OPR 0 12
-19 JMC 0 24
-20 LIT 0 32
-21 LOD 0 3
-22 OPR 0 4
-23 STO 0 3
-24 RET 0 0
+16 LIT 0 32
+17 LOD 0 3
+18 OPR 0 4
+19 STO 0 3
+20 RET 0 0
 """, code, "if_or")
 
     def test_bool(self):
@@ -189,31 +229,23 @@ class Test(TestCase):
             code = start_compiler("../sample_input/complex_bool.swift")
             self.assertEqual("""0 INT 0 3
 1 LIT 0 1
-2 JMC 0 26
+2 JMC 0 18
 3 LIT 0 1
 4 LIT 0 -10
 5 OPR 0 12
-6 JMC 0 26
+6 JMC 0 18
 7 LIT 0 -5
 8 LIT 0 -5
 9 OPR 0 12
-10 LIT 0 -1
-11 OPR 0 2
-12 LIT 0 -1
-13 OPR 0 2
-14 JMC 0 23
-15 LIT 0 0
-16 LIT 0 -1
-17 OPR 0 2
-18 JMC 0 23
-19 LIT 0 0
-20 LIT 0 -1
-21 OPR 0 2
-22 JMC 0 26
-23 INT 0 1
-24 LIT 0 9000
-25 STO 0 3
-26 RET 0 0
+10 JMC 0 15
+11 LIT 0 1
+12 JMC 0 15
+13 LIT 0 1
+14 JMC 0 18
+15 INT 0 1
+16 LIT 0 9000
+17 STO 0 3
+18 RET 0 0
 """, code, "complex_bool")
 
     def test_if_else(self):
@@ -346,8 +378,7 @@ class Test(TestCase):
 17 OPR 0 2
 18 STO 0 4
 19 JMP 0 7
-20 LIT 0 1
-21 RET 0 0
+20 RET 0 0
 """, code, "for")
 
     def test_func(self):
@@ -446,7 +477,7 @@ class Test(TestCase):
 1 INT 0 1
 2 LIT 0 52
 3 STO 0 3
-4 JMP 0 27
+4 JMP 0 26
 5 INT 0 3
 6 LOD 0 -1
 7 INT 0 1
@@ -465,22 +496,21 @@ class Test(TestCase):
 20 OPR 0 2
 21 STO 0 4
 22 JMP 0 10
-23 LIT 0 1
-24 LOD 0 3
-25 STO 0 -2
-26 RET 0 0
-27 INT 0 1
-28 LOD 0 3
-29 CAL 0 5
-30 INT 0 -1
-31 STO 0 3
-32 RET 0 0
+23 LOD 0 3
+24 STO 0 -2
+25 RET 0 0
+26 INT 0 1
+27 LOD 0 3
+28 CAL 0 5
+29 INT 0 -1
+30 STO 0 3
+31 RET 0 0
 """, code, "for_in_func")
 
     def test_program(self):
         code = start_compiler("../sample_input/program.swift")
         self.assertEqual("""0 INT 0 3
-1 JMP 0 27
+1 JMP 0 28
 2 INT 0 3
 3 LOD 0 -1
 4 INT 0 1
@@ -504,55 +534,55 @@ class Test(TestCase):
 22 LOD 0 4
 23 OPR 0 4
 24 STO 0 4
-25 STO 0 -2
-26 RET 0 0
-27 JMP 0 49
-28 INT 0 3
-29 LOD 0 -1
-30 INT 0 1
-31 LIT 0 1
-32 STO 0 4
-33 LOD 0 4
-34 LIT 0 21
-35 OPR 0 10
-36 JMC 0 46
-37 LOD 0 4
-38 LIT 0 5
-39 OPR 0 2
-40 STO 0 3
-41 LIT 0 1
-42 LOD 0 4
-43 OPR 0 2
-44 STO 0 4
-45 JMP 0 33
-46 LOD 0 3
-47 STO 0 -2
-48 RET 0 0
-49 JMP 0 77
-50 INT 0 3
-51 LOD 0 -2
-52 LOD 0 -1
-53 INT 0 1
-54 LIT 0 1
-55 STO 0 5
-56 LOD 0 5
-57 LIT 0 20
-58 OPR 0 10
-59 JMC 0 73
-60 LIT 0 1
-61 LOD 0 3
-62 OPR 0 2
-63 STO 0 3
-64 LIT 0 2
-65 LOD 0 4
-66 OPR 0 2
-67 STO 0 4
-68 LIT 0 1
-69 LOD 0 5
-70 OPR 0 2
-71 STO 0 5
-72 JMP 0 56
-73 LIT 0 2
+25 LOD 0 4
+26 STO 0 -2
+27 RET 0 0
+28 JMP 0 50
+29 INT 0 3
+30 LOD 0 -1
+31 INT 0 1
+32 LIT 0 1
+33 STO 0 4
+34 LOD 0 4
+35 LIT 0 21
+36 OPR 0 10
+37 JMC 0 47
+38 LOD 0 4
+39 LIT 0 5
+40 OPR 0 2
+41 STO 0 3
+42 LIT 0 1
+43 LOD 0 4
+44 OPR 0 2
+45 STO 0 4
+46 JMP 0 34
+47 LOD 0 3
+48 STO 0 -2
+49 RET 0 0
+50 JMP 0 77
+51 INT 0 3
+52 LOD 0 -2
+53 LOD 0 -1
+54 INT 0 1
+55 LIT 0 1
+56 STO 0 5
+57 LOD 0 5
+58 LIT 0 20
+59 OPR 0 10
+60 JMC 0 74
+61 LIT 0 1
+62 LOD 0 3
+63 OPR 0 2
+64 STO 0 3
+65 LIT 0 2
+66 LOD 0 4
+67 OPR 0 2
+68 STO 0 4
+69 LIT 0 1
+70 LOD 0 5
+71 OPR 0 2
+72 STO 0 5
+73 JMP 0 57
 74 LOD 0 3
 75 STO 0 -3
 76 RET 0 0
@@ -620,7 +650,7 @@ class Test(TestCase):
 138 INT 0 1
 139 LOD 0 7
 140 LOD 0 8
-141 CAL 0 50
+141 CAL 0 51
 142 INT 0 -2
 143 STO 0 7
 144 INT 0 1
@@ -645,7 +675,7 @@ class Test(TestCase):
 1 INT 0 1
 2 LIT 0 52
 3 STO 0 3
-4 JMP 0 27
+4 JMP 0 26
 5 INT 0 3
 6 LOD 0 -1
 7 INT 0 1
@@ -664,51 +694,619 @@ class Test(TestCase):
 20 OPR 0 2
 21 STO 0 4
 22 JMP 0 10
-23 LIT 0 1
-24 LOD 0 3
-25 STO 0 -2
-26 RET 0 0
-27 INT 0 1
-28 LOD 0 3
-29 CAL 0 5
-30 INT 0 -1
-31 STO 0 3
-32 LIT 0 100
+23 LOD 0 3
+24 STO 0 -2
+25 RET 0 0
+26 INT 0 1
+27 LOD 0 3
+28 CAL 0 5
+29 INT 0 -1
+30 STO 0 3
+31 LIT 0 100
+32 LOD 0 3
+33 OPR 0 10
+34 JMC 0 45
+35 LOD 0 3
+36 LIT 0 1
+37 OPR 0 3
+38 STO 0 3
+39 LOD 0 3
+40 LIT 0 50
+41 OPR 0 12
+42 JMC 0 44
+43 JMP 0 35
+44 JMP 0 65
+45 LIT 0 1
+46 LOD 0 3
+47 OPR 0 10
+48 JMC 0 65
+49 LIT 0 32
+50 LOD 0 3
+51 OPR 0 4
+52 STO 0 3
+53 LOD 0 3
+54 LIT 0 43
+55 OPR 0 12
+56 JMC 0 61
+57 LOD 0 3
+58 LIT 0 9
+59 OPR 0 2
+60 JMP 0 64
+61 LOD 0 3
+62 LIT 0 5
+63 OPR 0 2
+64 STO 0 3
+65 RET 0 0
+""", code, "complex_program")
+
+    def test_statement_after_for_loop(self):
+        """
+        It tests that no part of the loop body is executed again after the for loop ends
+        """
+        code = ("var r: Int = 0;\n"
+                "for(var l: Int = 1; l < 4; l += 1;) {\n    r += 2 + 3;\n}\n")
+        self.assertEqual(15, run_program(code, 0)["r"])
+
+    def test_return_after_if_else(self):
+        """
+        It tests that the returned expression is evaluated when the return statement follows if-else
+        """
+        code = ("func f(d: Int) -> Int {\n    var b: Int = 20;\n"
+                "    if (d > 1) {\n        b = 3;\n    }\n    else {\n        b = 4;\n    }\n"
+                "    return b;\n}\n"
+                "var a: Int = 0;\na = f(5);\n")
+        self.assertEqual(3, run_program(code, 0)["a"])
+
+    def test_product_expression(self):
+        """
+        It tests that operands of the product assigned as a whole expression are loaded only once
+        """
+        code = "var a: Int = 6;\nvar b: Int = 7;\nvar d: Int = 0;\nd = a * b;\n"
+        self.assertEqual("""0 INT 0 3
+1 INT 0 1
+2 LIT 0 6
+3 STO 0 3
+4 INT 0 1
+5 LIT 0 7
+6 STO 0 4
+7 INT 0 1
+8 LIT 0 0
+9 STO 0 5
+10 LOD 0 3
+11 LOD 0 4
+12 OPR 0 4
+13 STO 0 5
+14 RET 0 0
+""", compile_program(code).return_code())
+
+    def test_unbound_identifier(self):
+        """
+        It tests that loading an identifier without a symbol record is an error, not a missing instruction
+        """
+        lexer, parser = get_parser()
+        dst = parser.parse("var a: Int = 1;\nvar b: Int = 0;\nb = a;\n", lexer=lexer)
+        table_of_symbols = {}
+        generate_table_of_symbols(table_of_symbols, dst)
+        annotate_types(dst)
+        for node in dst.traverse():
+            if node.name == "var_value_identifier":
+                node.children[0].symbol = None
+        with self.assertRaises(Exception) as context:
+            Pl0(dst, table_of_symbols).generate_instructions()
+        self.assertEqual("Error on line 3. Identifier a is not declared.", str(context.exception))
+
+    def test_all_samples(self):
+        """
+        It tests that every sample is compiled at every optimization level and the PL/0 machine runs it
+        """
+        with TemporaryDirectory() as output_dir:
+            for file_name in sorted(glob("../sample_input/*.swift")):
+                for optimization_level in range(max_optimization_level + 1):
+                    start_compiler(file_name, output_dir=output_dir, optimization_level=optimization_level,
+                                   save_tree_files=False)
+                    with open(os.path.join(output_dir, "output", "generated_code_with_input.txt")) as f:
+                        self.assertNotIn("ERR", f.read(), (file_name, optimization_level))
+
+    def test_loop_invariant(self):
+        code = start_compiler("../sample_input/loop_invariant.swift", optimization_level=1)
+        self.assertEqual("""0 INT 0 3
+1 INT 0 1
+2 LIT 0 6
+3 STO 0 3
+4 INT 0 1
+5 LIT 0 7
+6 STO 0 4
+7 INT 0 1
+8 LIT 0 0
+9 STO 0 5
+10 INT 0 1
+11 LOD 0 3
+12 LOD 0 4
+13 OPR 0 4
+14 STO 0 6
+15 LOD 0 5
+16 LIT 0 100
+17 OPR 0 10
+18 JMC 0 24
+19 LOD 0 6
+20 LOD 0 5
+21 OPR 0 2
+22 STO 0 5
+23 JMP 0 15
+24 JMP 0 57
+25 INT 0 3
+26 LOD 0 -2
+27 LOD 0 -1
+28 INT 0 1
+29 LIT 0 0
+30 STO 0 5
+31 INT 0 1
+32 LOD 0 3
+33 LOD 0 4
+34 OPR 0 4
+35 LIT 0 1
+36 OPR 0 2
+37 STO 0 6
+38 INT 0 1
+39 LIT 0 0
+40 STO 0 7
+41 LOD 0 7
+42 LIT 0 10
+43 OPR 0 10
+44 JMC 0 54
+45 LOD 0 6
+46 LOD 0 5
+47 OPR 0 2
+48 STO 0 5
+49 LIT 0 1
+50 LOD 0 7
+51 OPR 0 2
+52 STO 0 7
+53 JMP 0 41
+54 LOD 0 5
+55 STO 0 -3
+56 RET 0 0
+57 INT 0 1
+58 LOD 0 3
+59 LIT 0 3
+60 CAL 0 25
+61 INT 0 -2
+62 STO 0 5
+63 RET 0 0
+""", code, "loop_invariant")
+
+    def test_loop_invariant_semantics(self):
+        """
+        It tests that programs with hoisted expressions give the same results as without optimizations,
+        the loop in the branch that is not executed must not move addresses of the next variables.
+        """
+        for code in ("var a: Int = 3; var b: Int = 4; var s: Int = 0; var k: Int = 0;"
+                     "if (a > 100) { while k < 2 { k += 1; s += a * b; } }"
+                     "var y: Int = 5; var z: Int = 7; s = a * b + a;",
+                     "var a: Int = 3; var b: Int = 4; var s: Int = 0; var k: Int = 0;"
+                     "if (a < 100) { while k < 2 { k += 1; s += a * b; } }"
+                     "var y: Int = 5; var z: Int = 7; s = s + a * b;",
+                     "func f(x: Int) -> Int { var r: Int = 0; var i: Int = 0; if (x > 100) { while i < 2 { i += 1;"
+                     "r += x * 2; } } var t: Int = 9; return r + t; } var a: Int = f(3); var z: Int = 7;"):
+            expected = run_program(code, 0)
+            for optimization_level in (2, 3):
+                self.assertEqual(expected, run_program(code, optimization_level), code)
+
+    def test_jmc_pops_condition(self):
+        """
+        It tests that JMC removes the condition from the stack whether it jumps or not
+        """
+        for condition in (0, 1):
+            stack = run_pl0_code([["INT", 0, 1], ["LIT", 0, condition], ["JMC", 0, 3], ["LIT", 0, 5], ["STO", 0, 0],
+                                  ["RET", 0, 0]])
+            self.assertEqual("0\t5\n1\t5\n", stack, condition)
+
+    def test_step_limit(self):
+        """
+        It tests that the PL/0 machine stops a program running longer than the limit
+        """
+        with self.assertRaises(RuntimeError):
+            run_pl0_code([["INT", 0, 3], ["JMP", 0, 1]], max_steps=100)
+
+    def test_common_subexpression(self):
+        code = start_compiler("../sample_input/common_subexpression.swift", optimization_level=1)
+        self.assertEqual("""0 INT 0 3
+1 INT 0 1
+2 LIT 0 6
+3 STO 0 3
+4 INT 0 1
+5 LIT 0 7
+6 STO 0 4
+7 INT 0 1
+8 LOD 0 3
+9 LOD 0 4
+10 OPR 0 4
+11 STO 0 5
+12 INT 0 1
+13 LOD 0 5
+14 LIT 0 1
+15 OPR 0 2
+16 STO 0 6
+17 INT 0 1
+18 LIT 0 0
+19 STO 0 7
+20 LOD 0 6
+21 LIT 0 40
+22 OPR 0 12
+23 JMC 0 26
+24 LOD 0 5
+25 JMP 0 29
+26 LOD 0 5
+27 LIT 0 1
+28 OPR 0 3
+29 STO 0 7
+30 LOD 0 5
+31 STO 0 6
+32 LIT 0 1
 33 LOD 0 3
-34 OPR 0 10
-35 JMC 0 46
+34 OPR 0 2
+35 STO 0 3
 36 LOD 0 3
-37 LIT 0 1
-38 OPR 0 3
-39 STO 0 3
-40 LOD 0 3
-41 LIT 0 50
-42 OPR 0 12
-43 JMC 0 45
-44 JMP 0 36
-45 JMP 0 66
-46 LIT 0 1
-47 LOD 0 3
-48 OPR 0 10
-49 JMC 0 66
-50 LIT 0 32
-51 LOD 0 3
-52 OPR 0 4
-53 STO 0 3
-54 LOD 0 3
-55 LIT 0 43
-56 OPR 0 12
-57 JMC 0 62
-58 LOD 0 3
-59 LIT 0 9
-60 OPR 0 2
-61 JMP 0 65
-62 LOD 0 3
-63 LIT 0 5
-64 OPR 0 2
-65 STO 0 3
-66 RET 0 0
-""", code, "complex_program")
+37 LOD 0 4
+38 OPR 0 4
+39 STO 0 7
+40 RET 0 0
+""", code, "common_subexpression")
+
+    def test_common_subexpression_semantics(self):
+        """
+        It tests that programs with eliminated expressions give the same results as without optimizations,
+        the expression in the branch that is not executed must not move addresses of the next variables.
+        """
+        for code in ("var a: Int = 3; var b: Int = 4; var s: Int = 0; if (a > 100) { s = a * b + a * b; }"
+                     "var y: Int = 5; var z: Int = 7; s = a * b + a;",
+                     "var a: Int = 3; var b: Int = 4; var s: Int = 0; if (a < 100) { s = a * b + a * b; }"
+                     "var y: Int = 5; var z: Int = 7; s = s + a * b + a * b;",
+                     "func f(x: Int) -> Int { var r: Int = 0; if (x > 100) { r = x * 2 + x * 2; }"
+                     "var t: Int = 9; return r + t; } var a: Int = f(3); var z: Int = 7;"):
+            expected = run_program(code, 0)
+            for optimization_level in (2, 3):
+                self.assertEqual(expected, run_program(code, optimization_level), code)
+
+    def test_jump_threading(self):
+        code = start_compiler("../sample_input/jump_threading.swift", optimization_level=2)
+        self.assertEqual("""0 INT 0 3
+1 INT 0 1
+2 LIT 0 5
+3 STO 0 3
+4 INT 0 1
+5 LIT 0 0
+6 STO 0 4
+7 LOD 0 3
+8 LIT 0 0
+9 OPR 0 12
+10 JMC 0 29
+11 LIT 0 1
+12 LOD 0 3
+13 OPR 0 3
+14 STO 0 3
+15 LOD 0 3
+16 LIT 0 2
+17 OPR 0 12
+18 JMC 0 24
+19 LIT 0 1
+20 LOD 0 4
+21 OPR 0 2
+22 STO 0 4
+23 JMP 0 7
+24 LIT 0 1
+25 LOD 0 4
+26 OPR 0 3
+27 STO 0 4
+28 JMP 0 7
+29 RET 0 0
+""", code, "jump_threading")
+
+    def test_function_evaluation(self):
+        code = start_compiler("../sample_input/function_evaluation.swift", optimization_level=3)
+        self.assertEqual("""0 INT 0 3
+1 INT 0 1
+2 LIT 0 0
+3 STO 0 3
+4 INT 0 1
+5 LIT 0 0
+6 STO 0 4
+7 JMP 0 19
+8 INT 0 3
+9 LOD 0 -2
+10 LOD 0 -1
+11 INT 0 1
+12 LOD 0 3
+13 LOD 0 4
+14 OPR 0 4
+15 STO 0 5
+16 LOD 0 5
+17 STO 0 -3
+18 RET 0 0
+19 LIT 0 144
+20 STO 0 3
+21 LIT 0 20
+22 STO 0 4
+23 INT 0 1
+24 LOD 0 3
+25 LIT 0 2
+26 CAL 0 8
+27 INT 0 -2
+28 STO 0 4
+29 RET 0 0
+""", code, "function_evaluation")
+
+    def test_symbol_table_cache(self):
+        """
+        It tests that the cached table of symbols gives the same code as the generated one.
+        """
+        code = start_compiler("../sample_input/program.swift")
+        with TemporaryDirectory() as cache_dir:
+            self.assertEqual(code, start_compiler("../sample_input/program.swift", cache_dir=cache_dir), "cache miss")
+            self.assertEqual(1, len(os.listdir(cache_dir)), "cached tables")
+            self.assertEqual(code, start_compiler("../sample_input/program.swift", cache_dir=cache_dir), "cache hit")
+
+    def test_typed_tree(self):
+        """
+        It tests that the semantic analysis stores types of values in the tree
+        and names of functions are bound to their records.
+        """
+        for file_name, expected in (("../sample_input/bool.swift",
+                                     {"expression_term": {"Boolean", "Int"}, "factor": {"Boolean", "Int"},
+                                      "factor_expression": {"Boolean", "Int"}, "var_value_boolean": {"Boolean"},
+                                      "var_value_identifier": {"Boolean"}, "var_value": {"Int"}}),
+                                    ("../sample_input/declaration.swift",
+                                     {"const_expression_term": {"Int"}, "expression_sum": {"Int"},
+                                      "expression_term": {"Int"}, "factor": {"Int"}, "factor_expression": {"Int"},
+                                      "var_value_identifier": {"Int"}, "var_value": {"Int"}}),
+                                    ("../sample_input/func_simple.swift",
+                                     {"expression_sum": {"Int"}, "expression_term": {"Int"}, "factor": {"Int"},
+                                      "factor_expression": {"Int"}, "var_value": {"Int"},
+                                      "var_value_identifier": {"Int"}, "function_call": {"Int"}})):
+            with open(file_name) as f:
+                code = f.read()
+            lexer, parser = get_parser()
+            dst = parser.parse(code, lexer=lexer)
+            table_of_symbols = {}
+            generate_table_of_symbols(table_of_symbols, dst)
+            Analyzer(dst, table_of_symbols).Analyze()
+            types = {}
+            for node in dst.traverse():
+                if node.dtype is not None:
+                    types.setdefault(node.name, set()).add(node.dtype)
+                if node.name == "function_signature":
+                    self.assertIs(table_of_symbols[node.children[0].name], node.children[0].symbol, file_name)
+            self.assertEqual(expected, types, file_name)
+
+    def test_types_without_analysis(self):
+        """
+        It tests that types stored for a table of symbols from the cache, when the analysis is skipped,
+        are the same as types stored by the analysis.
+        """
+        for file_name in ("../sample_input/bool.swift", "../sample_input/func_simple.swift",
+                          "../sample_input/ternary_operator.swift", "../sample_input/program.swift"):
+            with open(file_name) as f:
+                code = f.read()
+            lexer, parser = get_parser()
+            dst = parser.parse(code, lexer=lexer)
+            table_of_symbols = {}
+            generate_table_of_symbols(table_of_symbols, dst)
+            Analyzer(dst, table_of_symbols).Analyze()
+            lexer, parser = get_parser()
+            cached_dst = parser.parse(code, lexer=lexer)
+            resolve_names(cached_dst, table_of_symbols)
+            annotate_types(cached_dst)
+            self.assertEqual([(i.name, i.dtype) for i in dst.traverse()],
+                             [(i.name, i.dtype) for i in cached_dst.traverse()], file_name)
+
+    def test_types_after_passes(self):
+        """
+        It tests that optimization passes store types of the values they make, the optimized tree
+        has the same types as if it was typed again.
+        """
+        for file_name in ("../sample_input/loop_invariant.swift", "../sample_input/common_subexpression.swift",
+                          "../sample_input/function_evaluation.swift"):
+            with open(file_name) as f:
+                code = f.read()
+            lexer, parser = get_parser()
+            dst = parser.parse(code, lexer=lexer)
+            table_of_symbols = {}
+            generate_table_of_symbols(table_of_symbols, dst)
+            Analyzer(dst, table_of_symbols).Analyze()
+            PassManager(max_optimization_level).run_tree_passes(dst, table_of_symbols)
+            types = [(i.name, i.dtype) for i in dst.traverse()]
+            annotate_types(dst)
+            self.assertEqual([(i.name, i.dtype) for i in dst.traverse()], types, file_name)
+
+    def test_string_value_not_compiled(self):
+        """
+        It tests that a value without representation in the PL/0 machine is an error, not a missing instruction
+        """
+        with self.assertRaises(Exception) as context:
+            compile_program("var s: String = \"abc\";\n")
+        self.assertEqual("Error on line 1. Value of type String can not be compiled to PL/0.", str(context.exception))
+
+    def test_function_checked_independently(self):
+        """
+        It tests that a function is checked independently of the code before it, the condition with literals
+        is not taken for a function call because of the call before the function.
+        """
+        code = ("func g(c: Int) -> Int {\n    c += 1;\n    return c;\n}\n"
+                "var a: Int = g(1);\n"
+                "func h(b: Int) -> Int {\n    if (1 < 2) {\n        b += 1;\n    }\n    return b;\n}\n")
+        for lexer_name, parser_name in (("ply", "ply"), ("regex", "descent")):
+            lexer, parser = get_parser(lexer_name, parser_name)
+            dst = parser.parse(code, lexer=lexer)
+            table_of_symbols = {}
+            generate_table_of_symbols(table_of_symbols, dst)
+            self.assertTrue(Analyzer(dst, table_of_symbols).Analyze(), parser_name)
+
+    def test_functions_checked_by_executor(self):
+        """
+        It tests that functions checked as tasks of a thread pool give the same types as the sequential check
+        and errors of functions and of the code around them are reported in the order of the source.
+        """
+        code = ("func f(c: Int) -> Int {\n    c += 1;\n    return c;\n}\n"
+                "let k: Int = 2;\nk = 3;\n"
+                "func g(b: Int) -> Int {\n    b += 1;\n}\n"
+                "var a: Int = f(1);\n"
+                "func h(b: Int) -> Int {\n    var d: Int = true;\n    return d;\n}\n")
+        errors = ("Error on line 6 in variable modification identifier k is a constant. "
+                  "Its value cannot be adjusted at runtime.\n"
+                  "Error on line 10. Body of function: g does not contain one return statement. \n"
+                  "Type mismatch, cannot assign expression of type Boolean to variable with type Int")
+        with open("../sample_input/program.swift") as f:
+            program = f.read()
+        with ThreadPoolExecutor(4) as executor:
+            for task_executor in (None, executor):
+                lexer, parser = get_parser()
+                dst = parser.parse(code, lexer=lexer)
+                table_of_symbols = {}
+                generate_table_of_symbols(table_of_symbols, dst)
+                with self.assertRaises(Exception) as context:
+                    Analyzer(dst, table_of_symbols).Analyze(task_executor)
+                self.assertEqual(errors, str(context.exception))
+            types = []
+            for task_executor in (None, executor):
+                lexer, parser = get_parser()
+                dst = parser.parse(program, lexer=lexer)
+                table_of_symbols = {}
+                generate_table_of_symbols(table_of_symbols, dst)
+                self.assertTrue(Analyzer(dst, table_of_symbols).Analyze(task_executor))
+                types.append([(i.name, i.dtype) for i in dst.traverse()])
+            self.assertEqual(types[0], types[1])
+
+    def test_parenthesized_constant(self):
+        """
+        It tests that the constant folded in parentheses is an integer, also when nothing before it has a type.
+        """
+        code = ("func f1(p2: Int) -> Int {\n    var res2: Int = p2;\n    return res2;\n}\n"
+                "var g0: Int = (5 + 3);\n")
+        for lexer_name, parser_name in (("ply", "ply"), ("regex", "descent")):
+            lexer, parser = get_parser(lexer_name, parser_name)
+            dst = parser.parse(code, lexer=lexer)
+            table_of_symbols = {}
+            generate_table_of_symbols(table_of_symbols, dst)
+            self.assertTrue(Analyzer(dst, table_of_symbols).Analyze(), parser_name)
+            self.assertEqual({"Int"}, {i.dtype for i in dst.traverse() if i.name == "expression_in_parent"},
+                             parser_name)
+
+    def test_startup_imports(self):
+        """
+        It tests that dependencies of optional features are not imported with the compiler.
+        """
+        process = subprocess.run([sys.executable, "-X", "importtime", "-c", "import src.start_compiler"],
+                                 cwd="..", capture_output=True, text=True)
+        imported = {line.split("|")[-1].strip() for line in process.stderr.splitlines()}
+        self.assertEqual(set(), imported & {"ete3", "json", "hashlib", "src.pl0_vm.p_machine",
+                                            "src.lex_analyzer.regex_lexer", "src.syntax_analyzer.descent_parser",
+                                            "src.semantics_analyzer.analyzer", "src.optimizer.loop_invariant",
+                                            "src.optimizer.common_subexpression", "src.optimizer.function_evaluation",
+                                            "src.optimizer.jump_threading"}, "startup imports")
+
+    def test_regex_lexer(self):
+        """
+        It tests that the regex lexer gives the same tokens as the PLY lexer on all sample inputs.
+        """
+        for file_name in sorted(glob("../sample_input/**/*.swift", recursive=True)):
+            with open(file_name) as f:
+                code = f.read()
+            streams = []
+            for lexer_name in lexer_names:
+                lexer, _ = get_parser(lexer_name)
+                lexer.input(code)
+                streams.append([(i.type, i.value, i.lineno, i.lexpos) for i in iter(lexer.token, None)] +
+                               [lexer.lineno])
+            for stream in streams[1:]:
+                self.assertEqual(streams[0], stream, file_name)
+        self.assertEqual(start_compiler("../sample_input/program.swift"),
+                         start_compiler("../sample_input/program.swift", lexer_name="regex"), "regex lexer")
+
+    def test_descent_parser(self):
+        """
+        It tests that the recursive descent parser builds the same tree as the PLY parser on all sample inputs.
+        """
+        def get_nodes(root):
+            return [(i.name, i.lineno, len(i.children)) for i in root.traverse()]
+
+        for file_name in sorted(glob("../sample_input/**/*.swift", recursive=True)):
+            with open(file_name) as f:
+                code = f.read()
+            trees = []
+            for parser_name in parser_names:
+                lexer, parser = get_parser(parser_name=parser_name)
+                try:
+                    trees.append(get_nodes(parser.parse(code, lexer=lexer)))
+                except Exception as e:
+                    # not_tested/helloworld.swift is not valid
+                    trees.append(str(e))
+            self.assertEqual(trees[0], trees[1], file_name)
+        self.assertEqual(start_compiler("../sample_input/complex_program.swift", optimization_level=3),
+                         start_compiler("../sample_input/complex_program.swift", optimization_level=3,
+                                        parser_name="descent", lexer_name="regex"), "descent parser")
+
+    def test_stream_input(self):
+        """
+        It tests that tokens of a file read in small chunks are the same as tokens of the whole file.
+        """
+        lexer = RegexLexer()
+        for file_name in sorted(glob("../sample_input/**/*.swift", recursive=True)):
+            streams = []
+            for size in (None, 1, 7):
+                lexer.lineno = 1
+                with open(file_name) as f:
+                    if size is None:
+                        lexer.input(f.read())
+                    else:
+                        lexer.input_file(f, size)
+                    streams.append([(i.type, i.value, i.lineno, i.lexpos) for i in lexer] + [lexer.lineno])
+            self.assertEqual(streams[0], streams[1], file_name)
+            self.assertEqual(streams[0], streams[2], file_name)
+        self.assertEqual(start_compiler("../sample_input/program.swift"),
+                         start_compiler("../sample_input/program.swift", stream_input=True), "stream input")
+
+    def test_parallel_lexer(self):
+        """
+        It tests that tokens of parts of the input scanned in more processes are the same as tokens of the whole input,
+        an illegal character is reported after the tokens before it.
+        """
+        lexer = ParallelLexer(workers=3, part_size=64)
+        for file_name in sorted(glob("../sample_input/**/*.swift", recursive=True)):
+            with open(file_name) as f:
+                code = f.read()
+            streams = []
+            for i in (RegexLexer(), lexer):
+                for source in (code, code + "\n@\n" + code):
+                    i.lineno = 1
+                    i.input(source)
+                    tokens = []
+                    try:
+                        for token in i:
+                            tokens.append((token.type, token.value, token.lineno, token.lexpos))
+                    except Exception as e:
+                        tokens.append(str(e))
+                    streams.append(tokens + [i.lineno])
+            self.assertEqual(streams[:2], streams[2:], file_name)
+
+    def test_batch_compile(self):
+        """
+        It tests that every source of the directories and patterns is compiled to its own output directory
+        to the same code as alone, failures are reported in the summary.
+        """
+        with TemporaryDirectory() as output_dir:
+            results = compile_batch(["../sample_input/not_tested", "../sample_input/if*.swift"], output_dir, workers=2)
+            self.assertEqual(["if.swift", "if_If_else.swift", "if_and.swift", "if_and_or.swift", "if_else.swift",
+                              "if_or.swift", "array.swift", "hello_world_valid.swift", "helloworld.swift"],
+                             [os.path.basename(i[0]) for i in results], "sources")
+            self.assertEqual({"array.swift", "helloworld.swift"},
+                             {os.path.basename(i[0]) for i in results if i[1] is not None}, "failures")
+            for file_name, output in (("../sample_input/if.swift", "if"),
+                                      ("../sample_input/not_tested/hello_world_valid.swift",
+                                       "not_tested/hello_world_valid")):
+                with open(os.path.join(output_dir, output, "output", "generated_code_only.txt")) as f:
+                    self.assertEqual(start_compiler(file_name), f.read(), file_name)
+            with open(os.path.join(output_dir, summary_file_name)) as f:
+                self.assertIn("9 files", f.readline(), "summary")
 
     # def test_array(self):
     #         code = start_compiler("../sample_input/not_tested/array.swift")